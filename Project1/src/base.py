@@ -2,24 +2,83 @@ import time
 from PyQt5.QtCore import QThread, pyqtSignal
 from dispatch import Dispatcher
 
+# simulation speed range, as a multiple of real time
+MIN_SPEED = 0.1
+MAX_SPEED = 1000.0
+# most ticks stepped in one go when the thread falls behind
+MAX_BURST = 50
 
-class ElevatorThread(QThread):
+
+class SchedulerThread(QThread):
     """
-    Thread that periodically updates one elevator via Dispatcher.
-    Emits 1-based elevator index on each update.
+    Single thread that steps every elevator via Dispatcher once per tick.
+    Emits one coalesced update signal per tick (or per burst of ticks at high
+    speed), whatever the elevator count.
+    Commands submitted to the Dispatcher are drained here between ticks, so
+    only this thread ever mutates simulation state.
+    At `speed` x real time one tick (one virtual second) lasts 1/speed seconds.
     """
-    update_signal = pyqtSignal(int)
+    update_signal = pyqtSignal()
+    # list of (command, args, result) applied in one batch
+    command_signal = pyqtSignal(list)
 
-    def __init__(self, dispatcher: Dispatcher, elevator_idx: int):
+    def __init__(self, dispatcher: Dispatcher, speed: float = 1.0,
+                 poll: float = 0.05):
         super().__init__()
         self.dispatcher = dispatcher
-        self.elevator_idx = elevator_idx
+        self.speed = 1.0
+        # seconds between ticks
+        self.interval = 1.0
+        # seconds between command drains while waiting for the next tick
+        self.poll = poll
+        # monotonic time of the next tick
+        self._deadline = 0.0
+        self.set_speed(speed)
+
+    def set_speed(self, speed: float):
+        """
+        Set the simulation speed, clamped to [MIN_SPEED, MAX_SPEED].
+        Takes effect from the next tick; safe to call from the UI thread.
+        """
+        self.speed = min(max(speed, MIN_SPEED), MAX_SPEED)
+        self.interval = 1.0 / self.speed
+        # speeding up must not wait out a long tick scheduled at the old speed
+        self._deadline = min(self._deadline, time.monotonic() + self.interval)
+
+    def _drain(self) -> bool:
+        """
+        Apply queued commands and report them to the UI.
+        Returns True if any command was applied.
+        """
+        results = self.dispatcher.drain_commands()
+        if results:
+            self.command_signal.emit(results)
+        return bool(results)
 
     def run(self):
+        # Ticks are scheduled against absolute deadlines so they do not drift
+        self._deadline = time.monotonic()
         # Loop until someone calls requestInterruption()
         while not self.isInterruptionRequested():
-            # update backend model
-            self.dispatcher.update_elevator(self.elevator_idx)
-            # notify UI (use 1-based id)
-            self.update_signal.emit(self.elevator_idx + 1)
-            time.sleep(1)
+            now = time.monotonic()
+            deadline = self._deadline
+            if now < deadline:
+                # apply user commands promptly while waiting for the tick
+                time.sleep(min(self.poll, deadline - now))
+                if self._drain():
+                    self.update_signal.emit()
+                continue
+            self._drain()
+            interval = self.interval
+            # at high speed several ticks can be due; step them back to back
+            due = min(int((now - deadline) / interval) + 1, MAX_BURST)
+            for _ in range(due):
+                # update backend model for all elevators at once
+                self.dispatcher.step_all()
+            # notify UI once per burst
+            self.update_signal.emit()
+            deadline += due * interval
+            if deadline < now:
+                # fell behind: restart the cadence instead of bursting further
+                deadline = now + interval
+            self._deadline = deadline
@@ -0,0 +1,143 @@
+import argparse
+import json
+import math
+import time
+
+from dispatch import Dispatcher, FLOOR_NUM, ELEVATOR_NUM, DWELL_TIME
+from policy import POLICIES
+from simulation import Simulation
+from workload import generate, TraceReplay
+
+# Standard scenarios: traffic profile, ticks of traffic and passengers per tick
+SCENARIOS = {
+    "up-peak": {"profile": "up-peak", "duration": 3600, "rate": 0.25},
+    "down-peak": {"profile": "down-peak", "duration": 3600, "rate": 0.25},
+    "lunch": {"profile": "lunch", "duration": 3600, "rate": 0.2},
+    "inter-floor": {"profile": "inter-floor", "duration": 3600, "rate": 0.15},
+}
+# ticks per hour: one tick is one virtual second
+TICKS_PER_HOUR = 3600
+# a scenario is cut off this many ticks after its last arrival
+DRAIN_LIMIT = 3600
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Nearest-rank percentile of `values` (0 < q <= 100).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summarize(replay: TraceReplay, elapsed: float) -> dict:
+    """
+    Wait/journey statistics and throughput of a finished replay.
+    """
+    completed = replay.completed
+    sim = replay.sim
+    waits = [boarded - p.time for p, boarded, _ in completed]
+    journeys = [arrived - p.time for p, _, arrived in completed]
+    count = len(completed)
+    calls = sim.dispatcher.metrics
+    return {
+        "passengers": len(replay.trace),
+        "completed": count,
+        "ticks": sim.now,
+        "avg_wait": sum(waits) / count if count else 0.0,
+        "p95_wait": percentile(waits, 95),
+        "avg_journey": sum(journeys) / count if count else 0.0,
+        "p95_journey": percentile(journeys, 95),
+        "passengers_per_hour": count * TICKS_PER_HOUR / sim.now if sim.now else 0.0,
+        "ticks_per_second": sim.steps / elapsed if elapsed else 0.0,
+        # call-level latencies recorded by the Dispatcher itself
+        "hall_wait_p99": calls.wait.percentile(99),
+        "car_call_p99": calls.ride.percentile(99),
+        "step_us_mean": calls.step.summary()["mean_us"],
+    }
+
+
+def run_scenario(name: str, dispatcher: Dispatcher, seed: int = 0,
+                 batch_calls: bool = False) -> dict:
+    """
+    Replay one standard scenario headlessly against `dispatcher`.
+    """
+    scenario = SCENARIOS[name]
+    trace = generate(scenario["profile"], scenario["duration"], scenario["rate"],
+                     dispatcher.floor_num, seed)
+    replay = TraceReplay(Simulation(dispatcher, batch_calls), trace)
+    start = time.perf_counter()
+    replay.run(limit=scenario["duration"] + DRAIN_LIMIT)
+    return summarize(replay, time.perf_counter() - start)
+
+
+def run_suite(floor_num: int = FLOOR_NUM, elevator_num: int = ELEVATOR_NUM,
+              dwell_time: int = DWELL_TIME, policy: str = "three-phase",
+              batch_calls: bool = False, seed: int = 0, scenarios=None) -> dict:
+    """
+    Run the standard scenarios, each against a fresh Dispatcher.
+    Returns {scenario name: metrics}.
+    """
+    results = {}
+    for name in scenarios or SCENARIOS:
+        dispatcher = Dispatcher(floor_num, elevator_num, dwell_time, policy)
+        results[name] = run_scenario(name, dispatcher, seed, batch_calls)
+    return results
+
+
+def compare(results: dict, baseline: dict):
+    """
+    Print each metric next to the baseline run and its relative change.
+    """
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+        print(f"[{name}]")
+        for key, value in metrics.items():
+            old = baseline[name].get(key)
+            if not old:
+                continue
+            print(f"  {key:<20} {old:>12.2f} -> {value:>12.2f} ({(value - old) / old:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Elevator dispatch benchmark")
+    parser.add_argument("--output", default="benchmark.json", help="JSON results file")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--label", default="", help="free-form label stored with the results")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable, default all)")
+    parser.add_argument("--floors", type=int, default=FLOOR_NUM)
+    parser.add_argument("--elevators", type=int, default=ELEVATOR_NUM)
+    parser.add_argument("--dwell", type=int, default=DWELL_TIME)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="three-phase")
+    parser.add_argument("--batch", action="store_true", help="assign each tick's calls as a batch, "
+                        "at minimum total cost for policies with a batch_cost")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run_suite(args.floors, args.elevators, args.dwell, args.policy,
+                        args.batch, args.seed, args.scenario)
+    for name, metrics in results.items():
+        print(f"{name:<12} wait {metrics['avg_wait']:6.2f} (p95 {metrics['p95_wait']:4.0f})  "
+              f"journey {metrics['avg_journey']:6.2f} (p95 {metrics['p95_journey']:4.0f})  "
+              f"{metrics['passengers_per_hour']:7.1f} pax/h  "
+              f"{metrics['ticks_per_second']:10,.0f} ticks/s")
+
+    report = {
+        "label": args.label,
+        "config": {key: value for key, value in vars(args).items()
+                   if key not in ("output", "baseline", "label")},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import time
+
+from dispatch import Dispatcher, FLOOR_NUM, ELEVATOR_NUM, DWELL_TIME
+from policy import POLICIES
+from simulation import Simulation
+from workload import PROFILES, generate, load, TraceReplay
+from benchmark import DRAIN_LIMIT, summarize
+
+# metrics shown by the comparison table, with their column format
+COLUMNS = [
+    ("avg_wait", "{:.2f}"),
+    ("p95_wait", "{:.0f}"),
+    ("avg_journey", "{:.2f}"),
+    ("p95_journey", "{:.0f}"),
+    ("passengers_per_hour", "{:.1f}"),
+    ("ticks_per_second", "{:,.0f}"),
+]
+
+
+def compare_policies(trace: list, policies: list, floor_num: int = FLOOR_NUM,
+                     elevator_num: int = ELEVATOR_NUM, dwell_time: int = DWELL_TIME) -> dict:
+    """
+    Replay the same trace through a fresh Dispatcher for each policy.
+    Returns {policy name: metrics}.
+    """
+    end = trace[-1].time if trace else 0
+    results = {}
+    for policy in policies:
+        dispatcher = Dispatcher(floor_num, elevator_num, dwell_time, policy)
+        replay = TraceReplay(Simulation(dispatcher), trace)
+        start = time.perf_counter()
+        replay.run(limit=end + DRAIN_LIMIT)
+        results[policy] = summarize(replay, time.perf_counter() - start)
+    return results
+
+
+def print_table(results: dict):
+    """
+    Print one row per policy and one column per metric.
+    """
+    width = max(len(name) for name in results)
+    header = f"{'policy':<{width}}" + "".join(f"{key:>{len(key) + 2}}" for key, _ in COLUMNS)
+    print(header)
+    print("-" * len(header))
+    for name, metrics in results.items():
+        print(f"{name:<{width}}" +
+              "".join(f"{fmt.format(metrics[key]):>{len(key) + 2}}" for key, fmt in COLUMNS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dispatch policies on one trace")
+    parser.add_argument("--policy", action="append", choices=sorted(POLICIES),
+                        help="policy to run (repeatable, default all)")
+    parser.add_argument("--trace", help="trace file written by workload.py (overrides --profile)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="up-peak")
+    parser.add_argument("--duration", type=int, default=3600)
+    parser.add_argument("--rate", type=float, default=0.25)
+    parser.add_argument("--floors", type=int, default=FLOOR_NUM)
+    parser.add_argument("--elevators", type=int, default=ELEVATOR_NUM)
+    parser.add_argument("--dwell", type=int, default=DWELL_TIME)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.trace:
+        trace, floor_num = load(args.trace)
+    else:
+        floor_num = args.floors
+        trace = generate(args.profile, args.duration, args.rate, floor_num, args.seed)
+    results = compare_policies(trace, args.policy or list(POLICIES), floor_num,
+                               args.elevators, args.dwell)
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,106 @@
+import pickle
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from time import perf_counter_ns
+
+from metrics import DispatcherMetrics
+from policy import DispatchPolicy, get_policy
+
 FLOOR_NUM = 20
 ELEVATOR_NUM = 5
+# ticks to travel one floor
+FLOOR_TIME = 1
+# extra ticks a car keeps its doors open at a stop
+DWELL_TIME = 0
+# hall call directions, None for a call without a direction
+HALL_DIRECTIONS = ('up', 'down', None)
+# format version of Dispatcher.snapshot
+SNAPSHOT_VERSION = 1
 
 
 class Dispatcher:
     """
     Manage positions, requests, states, alerts and door flags for all elevators.
+    Other threads must not mutate state directly: they `submit` commands, which
+    the simulation loop applies in batches via `drain_commands`.
     """
-    def __init__(self):
+    # command name -> method applied when the command is drained
+    COMMANDS = {
+        'internal': 'assign_internal',
+        'external': 'assign_external',
+        'open': 'open_door',
+        'close': 'close_door',
+        'alert': 'toggle_alert',
+        'fast_forward': 'fast_forward',
+    }
+
+    def __init__(self, floor_num: int = FLOOR_NUM, elevator_num: int = ELEVATOR_NUM,
+                 dwell_time: int = DWELL_TIME, policy="three-phase"):
+        if floor_num < 2:
+            raise ValueError(f"A building needs at least 2 floors, got {floor_num}.")
+        if elevator_num < 1:
+            raise ValueError(f"A building needs at least 1 elevator, got {elevator_num}.")
+        self.floor_num = floor_num
+        self.elevator_num = elevator_num
+        # strategy for car selection and direction control (see policy.py)
+        self.policy: DispatchPolicy = get_policy(policy)
+        # travel[a][b]: ticks from floor a to floor b; dwell[f]: ticks held at f
+        self._travel = [[abs(a - b) * FLOOR_TIME for b in range(floor_num + 1)]
+                        for a in range(floor_num + 1)]
+        self._dwell = [0] + [dwell_time] * floor_num
+        self.dwell_time = dwell_time
         # per-elevator current floor
-        self.floors = [1] * ELEVATOR_NUM
-        # per-elevator sets of internal targets
-        self.targets = [set() for _ in range(ELEVATOR_NUM)]
-        # global set of pending external call floors
-        self.external_requests = set()
+        self.floors = [1] * elevator_num
+        # per-elevator target floors as bitmasks: bit f set = stop at floor f
+        self.targets = [0] * elevator_num
+        # pending hall calls: (floor, direction) -> index of the owning elevator
+        self.hall_calls = {}
+        # hall calls served during the last step, as (idx, floor, direction)
+        self.served_calls = []
         # per-elevator movement state: -1=down, 0=idle, 1=up
-        self.states = [0] * ELEVATOR_NUM
+        self.states = [0] * elevator_num
         # per-elevator alert flag
-        self.alerts = [False] * ELEVATOR_NUM
+        self.alerts = [False] * elevator_num
         # per-elevator door-open flag
-        self.opens = [False] * ELEVATOR_NUM
+        self.opens = [False] * elevator_num
+        # per-elevator ticks left with doors held open at a stop
+        self._holds = [0] * elevator_num
+        # simulation clock in ticks, advanced by step_all
+        self.clock = 0
+        # tick each pending hall call (by (floor, direction)) and car call
+        # (per elevator, by floor) was made; the latter are the pending car calls
+        self._hall_times = {}
+        self._car_times = [{} for _ in range(elevator_num)]
+        self.metrics = DispatcherMetrics()
+        # pending commands from other threads; deque append/popleft are atomic
+        self._commands = deque()
+        # non-alerted elevators grouped by state, as sorted (floor, idx) lists
+        self._index = {-1: [], 0: [], 1: []}
+        for idx in range(elevator_num):
+            self._index_add(idx)
+
+    def submit(self, command: str, *args):
+        """
+        Queue a command (a key of COMMANDS) from any thread.
+        It is applied by the next `drain_commands` call.
+        """
+        if command not in self.COMMANDS:
+            raise ValueError(f"Unknown command: {command}")
+        self._commands.append((command, args))
+
+    def drain_commands(self) -> list:
+        """
+        Apply all queued commands in submission order.
+        Must be called from the thread that steps the simulation.
+        Returns a list of (command, args, result) tuples.
+        """
+        results = []
+        commands = self._commands
+        while commands:
+            command, args = commands.popleft()
+            result = getattr(self, self.COMMANDS[command])(*args)
+            results.append((command, args, result))
+        return results
 
     def update_elevator(self, idx: int):
         """
@@ -26,46 +108,240 @@ class Dispatcher:
         move, open/close doors, clear requests, recalc state.
         """
         if not self.alerts[idx]:
+            if self._holds[idx]:
+                # doors stay open for the dwell time
+                self._holds[idx] -= 1
+                return
+            floor = old_floor = self.floors[idx]
+            state = self.states[idx]
+            targets = self.targets[idx]
+
             # move one floor if needed
-            if self.states[idx] == -1 and self.floors[idx] > 1:
-                self.floors[idx] -= 1
-            elif self.states[idx] == 1 and self.floors[idx] < FLOOR_NUM:
-                self.floors[idx] += 1
-
-            # open door if at a requested floor
-            if self.floors[idx] in self.targets[idx] or \
-               self.floors[idx] in self.external_requests:
-                self.opens[idx] = True
-                self.targets[idx].discard(self.floors[idx])
-                self.external_requests.discard(self.floors[idx])
-            else:
-                self.opens[idx] = False
+            if state == -1 and floor > 1:
+                floor -= 1
+            elif state == 1 and floor < self.floor_num:
+                floor += 1
+            self.floors[idx] = floor
+
+            # open door if at a requested floor whose calls this car serves
+            bit = 1 << floor
+            opened = False
+            if targets & bit:
+                if state == 1:
+                    ahead = targets >> (floor + 1)
+                else:
+                    ahead = targets & (bit - 1) if state == -1 else 0
+                opened, waiting = self._serve_stop(idx, floor, bool(ahead))
+                if not waiting:
+                    self.targets[idx] = targets & ~bit
+            self.opens[idx] = opened
+            if opened:
+                self._holds[idx] = self._dwell[floor]
 
             # recalculate movement state
             self._update_state(idx)
 
-    def _update_state(self, idx: int):
+            # keep the candidate index in sync
+            if floor != old_floor or self.states[idx] != state:
+                entries = self._index[state]
+                del entries[bisect_left(entries, (old_floor, idx))]
+                insort(self._index[self.states[idx]], (floor, idx))
+
+    def _index_add(self, idx: int):
         """
-        Decide new movement direction based on remaining internal targets.
+        Insert elevator idx into the candidate index at its current floor/state.
         """
-        if self.alerts[idx] or not self.targets[idx]:
-            self.states[idx] = 0
-            return
+        insort(self._index[self.states[idx]], (self.floors[idx], idx))
 
-        current = self.floors[idx]
-        highest = max(self.targets[idx])
-        lowest = min(self.targets[idx])
+    def _index_remove(self, idx: int, floor: int, state: int):
+        """
+        Remove elevator idx, indexed at (floor, state), from the candidate index.
+        """
+        entries = self._index[state]
+        del entries[bisect_left(entries, (floor, idx))]
+
+    def _nearest_below(self, state: int, floor: int):
+        """
+        Indexed elevator in `state` with the highest floor <= `floor`
+        (lowest idx among ties), as (floor, idx), or None.
+        """
+        entries = self._index[state]
+        pos = bisect_right(entries, (floor, self.elevator_num))
+        if pos == 0:
+            return None
+        pos = bisect_left(entries, (entries[pos - 1][0], -1))
+        return entries[pos]
+
+    def _nearest_above(self, state: int, floor: int, inclusive: bool = False):
+        """
+        Indexed elevator in `state` with the lowest floor > `floor`
+        (>= if inclusive; lowest idx among ties), as (floor, idx), or None.
+        """
+        entries = self._index[state]
+        if inclusive:
+            pos = bisect_left(entries, (floor, -1))
+        else:
+            pos = bisect_right(entries, (floor, self.elevator_num))
+        return entries[pos] if pos < len(entries) else None
+
+    def _nearest(self, states, floor: int) -> int:
+        """
+        Closest indexed elevator to `floor` among `states`, lowest idx among
+        ties, or -1 if there is none.
+        """
+        best = None
+        for state in states:
+            for entry in (self._nearest_below(state, floor),
+                          self._nearest_above(state, floor)):
+                if entry is not None:
+                    key = (abs(entry[0] - floor), entry[1])
+                    if best is None or key < best:
+                        best = key
+        return best[1] if best is not None else -1
+
+    def step_all(self):
+        """
+        Advance every elevator by one tick, in elevator order.
+        """
+        start = perf_counter_ns()
+        self.served_calls = []
+        for idx in range(self.elevator_num):
+            self.update_elevator(idx)
+        self.clock += 1
+        self.metrics.step.record(perf_counter_ns() - start)
 
-        if self.states[idx] == 0:
-            # idle: choose nearest target direction
-            if abs(highest - current) >= abs(lowest - current):
-                self.states[idx] = -1 if lowest < current else 1
+    def fast_forward(self, ticks: int) -> int:
+        """
+        Step `ticks` virtual seconds at once, without any rendering in between.
+        Once the building is idle the rest of the interval is skipped.
+        Returns the number of ticks the clock advanced.
+        """
+        end = self.clock + ticks
+        while self.clock < end:
+            if self.is_idle():
+                self.clock = end
+                break
+            self.step_all()
+        return ticks
+
+    def _serve_stop(self, idx: int, floor: int, ahead: bool):
+        """
+        Serve the calls of elevator idx at `floor`, one of its targets: its car
+        call and the hall calls it owns there in the direction it leaves in.
+        With targets `ahead` a moving car keeps its direction, so hall calls
+        the other way wait for its return; otherwise it serves them all.
+        Returns (doors open, hall calls of idx still waiting at `floor`).
+        """
+        opened = waiting = False
+        made = self._car_times[idx].pop(floor, None)
+        if made is not None:
+            self.metrics.ride.record(self.clock - made)
+            opened = True
+        state = self.states[idx]
+        heading = ('up' if state == 1 else 'down') if ahead and state else None
+        hall_calls = self.hall_calls
+        for direction in HALL_DIRECTIONS:
+            key = (floor, direction)
+            if hall_calls.get(key) != idx:
+                continue
+            if heading is None or direction is None or direction == heading:
+                del hall_calls[key]
+                self.metrics.wait.record(self.clock - self._hall_times.pop(key))
+                self.served_calls.append((idx, floor, direction))
+                opened = True
             else:
-                self.states[idx] = 1 if highest > current else -1
-        elif self.states[idx] == 1 and highest < current:
-            self.states[idx] = -1
-        elif self.states[idx] == -1 and lowest > current:
-            self.states[idx] = 1
+                waiting = True
+        return opened, waiting
+
+    def target_floors(self, idx: int) -> list:
+        """
+        Target floors of elevator idx in ascending order.
+        """
+        return list(_bits(self.targets[idx]))
+
+    def _target_mask(self, idx: int) -> int:
+        """
+        Target floors of elevator idx as a bitmask.
+        """
+        return self.targets[idx]
+
+    def snapshot(self) -> bytes:
+        """
+        Serialize the building configuration and the full simulation state:
+        floors, targets, hall and car calls with their call times, states,
+        alerts, doors and the clock. Metrics and queued commands are not
+        part of a snapshot. Restore it with `Dispatcher.restore`.
+        """
+        cars = range(self.elevator_num)
+        state = (
+            SNAPSHOT_VERSION, self.floor_num, self.elevator_num, self.dwell_time,
+            self.policy.name, self.clock,
+            [int(self.floors[idx]) for idx in cars],
+            [self._target_mask(idx) for idx in cars],
+            [int(self.states[idx]) for idx in cars],
+            [bool(self.alerts[idx]) for idx in cars],
+            [bool(self.opens[idx]) for idx in cars],
+            [int(self._holds[idx]) for idx in cars],
+            self.hall_calls, self._hall_times, self._car_times,
+        )
+        return pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def restore(cls, data: bytes, policy=None) -> "Dispatcher":
+        """
+        Build a dispatcher from a `snapshot`, with fresh metrics. Pending
+        hall and car calls keep their original call times, so their latencies
+        include the time before the snapshot, and they are counted in
+        `metrics.hall_calls` / `metrics.car_calls`. `policy` overrides the
+        snapshot's policy, e.g. to fork variants of one run.
+        """
+        (version, floor_num, elevator_num, dwell_time, policy_name, clock,
+         floors, targets, states, alerts, opens, holds,
+         hall_calls, hall_times, car_times) = pickle.loads(data)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        dispatcher = cls(floor_num, elevator_num, dwell_time,
+                         policy if policy is not None else policy_name)
+        dispatcher._load_cars(floors, targets, states, alerts, opens, holds)
+        dispatcher.hall_calls = hall_calls
+        dispatcher._hall_times = hall_times
+        dispatcher._car_times = car_times
+        dispatcher.clock = clock
+        # every latency recorded later belongs to a counted call
+        dispatcher.metrics.hall_calls = len(hall_times)
+        dispatcher.metrics.car_calls = sum(len(times) for times in car_times)
+        return dispatcher
+
+    def _load_cars(self, floors: list, targets: list, states: list, alerts: list,
+                   opens: list, holds: list):
+        """
+        Replace the per-elevator state (targets as bitmasks) and rebuild the
+        candidate index from it.
+        """
+        self.floors = floors
+        self.targets = targets
+        self.states = states
+        self.alerts = alerts
+        self.opens = opens
+        self._holds = holds
+        self._index = {-1: [], 0: [], 1: []}
+        for idx in range(self.elevator_num):
+            if not alerts[idx]:
+                self._index_add(idx)
+
+    def is_idle(self) -> bool:
+        """
+        True when a step would change nothing: all elevators stopped,
+        doors closed and no targets pending.
+        """
+        return not any(self.states) and not any(self.opens) and \
+            not any(self.targets)
+
+    def _update_state(self, idx: int):
+        """
+        Decide new movement direction via the policy.
+        """
+        self.states[idx] = self.policy.next_state(self, idx)
 
     def assign_internal(self, elevator_id: int, floor: int):
         """
@@ -73,82 +349,284 @@ class Dispatcher:
         """
         idx = elevator_id - 1
         if floor != self.floors[idx]:
-            self.targets[idx].add(floor)
+            self._set_target(idx, floor)
+            if floor not in self._car_times[idx]:
+                self._car_times[idx][floor] = self.clock
+                self.metrics.car_calls += 1
         return elevator_id
 
     def assign_external(self, floor: int, direction: str = None) -> int:
         """
-        Handle an external up/down call at `floor`:
-        1) Prefer an elevator already moving in the same `direction` that will pass `floor`.
-        2) Otherwise, choose the nearest idle elevator.
-        3) Otherwise, choose the nearest any-direction elevator.
+        Handle an external up/down call at `floor`: the policy picks the car
+        (by default the three-phase heuristic, see ThreePhasePolicy), which
+        owns the call until it serves it. A repeated call keeps its owner.
         Returns the assigned elevator_id (1-based), or -1 if none available.
         """
-        best_idx = -1
-        best_score = float('inf')
+        owner = self.hall_calls.get((floor, direction))
+        if owner is not None:
+            return owner + 1
+        best_idx = self.policy.select_car(self, floor, direction)
+        if best_idx >= 0:
+            self._record_external(best_idx, floor, direction)
+            return best_idx + 1
+
+        # No elevator available
+        return -1
 
-        # Phase 1: elevators moving in same direction that will pass the floor
-        for idx in range(ELEVATOR_NUM):
-            if self.alerts[idx]:
+    def _record_external(self, idx: int, floor: int, direction: str = None):
+        """
+        Record an external call at `floor` owned by elevator idx.
+        """
+        key = (floor, direction)
+        self._set_target(idx, floor)
+        self.hall_calls[key] = idx
+        # a reassigned call keeps its original call time
+        if key not in self._hall_times:
+            self._hall_times[key] = self.clock
+            self.metrics.hall_calls += 1
+        # If already at the same floor, open the door immediately
+        if self.floors[idx] == floor:
+            self.opens[idx] = True
+
+    def _stop_time(self, idx: int, low: int, high: int) -> int:
+        """
+        Dwell ticks of elevator idx's targets in floors (low, high].
+        """
+        if high <= low:
+            return 0
+        # the dwell table is uniform, so count the stops with a popcount
+        window = (1 << (high + 1)) - (1 << (low + 1))
+        return self.dwell_time * (self.targets[idx] & window).bit_count()
+
+    def eta(self, idx: int, floor: int, direction: str = None) -> int:
+        """
+        Estimated ticks until elevator idx reaches an external call at `floor`,
+        from the travel and dwell tables: the remaining dwell, then either the
+        direct trip if idle or the call lies ahead in its travel direction, or
+        the trip to its farthest target ahead and back; plus a dwell for every
+        pending stop passed on the way.
+        """
+        current = self.floors[idx]
+        state = self.states[idx]
+        travel = self._travel
+        wait = self._holds[idx]
+        if state == 0:
+            return wait + travel[current][floor]
+        if state == 1:
+            if floor >= current and direction != 'down':
+                return wait + travel[current][floor] + \
+                    self._stop_time(idx, current, floor - 1)
+            turn = max(self.targets[idx].bit_length() - 1, current, floor)
+            return wait + travel[current][turn] + travel[turn][floor] + \
+                self._stop_time(idx, current, turn) + \
+                self._stop_time(idx, floor, current - 1)
+        if floor <= current and direction != 'up':
+            return wait + travel[current][floor] + \
+                self._stop_time(idx, floor, current - 1)
+        targets = self.targets[idx]
+        lowest = (targets & -targets).bit_length() - 1 if targets else current
+        turn = min(lowest, current, floor)
+        return wait + travel[current][turn] + travel[turn][floor] + \
+            self._stop_time(idx, turn - 1, current - 1) + \
+            self._stop_time(idx, current, floor - 1)
+
+    def _eta_row(self, floor: int, direction: str, cars: list) -> list:
+        """
+        ETA of each elevator in `cars` to the call at `floor`.
+        """
+        return [self.eta(idx, floor, direction) for idx in cars]
+
+    def _best_eta(self, floor: int, direction: str) -> int:
+        """
+        Non-alerted elevator with the lowest ETA to the call (lowest idx among
+        ties), or -1. Cars whose bare travel time already reaches the best ETA
+        are skipped without counting their stops.
+        """
+        best_idx = -1
+        best_eta = float('inf')
+        travel = self._travel[floor]
+        for idx in range(self.elevator_num):
+            if self.alerts[idx] or \
+               self._holds[idx] + travel[self.floors[idx]] >= best_eta:
                 continue
+            eta = self.eta(idx, floor, direction)
+            if eta < best_eta:
+                best_eta, best_idx = eta, idx
+        return best_idx
 
-            # Only consider those already moving in requested direction
-            if direction == 'up' and self.states[idx] == 1 and self.floors[idx] <= floor:
-                score = floor - self.floors[idx]
-            elif direction == 'down' and self.states[idx] == -1 and self.floors[idx] >= floor:
-                score = self.floors[idx] - floor
+    def assign_external_batch(self, calls) -> list:
+        """
+        Assign a batch of external calls, given as (floor, direction) pairs,
+        by minimizing the total policy cost (DispatchPolicy.batch_cost, the
+        ETA for the eta policy) rather than greedily.
+        Each round gives at most one call per available elevator (a min-cost
+        assignment); costs are refreshed between rounds. A policy without a
+        cost model assigns the calls one by one, as assign_external does.
+        Returns the assigned elevator_id for each call, or -1 if none available.
+        """
+        calls = list(calls)
+        result = [-1] * len(calls)
+        cars = [idx for idx in range(self.elevator_num) if not self.alerts[idx]]
+        if not cars:
+            return result
+
+        # identical calls share one assignment, calls already owned keep it
+        positions = {}
+        for pos, call in enumerate(calls):
+            call = tuple(call)
+            owner = self.hall_calls.get(call)
+            if owner is not None:
+                result[pos] = owner + 1
             else:
-                continue
+                positions.setdefault(call, []).append(pos)
+        pending = list(positions)
 
-            if score < best_score:
-                best_score, best_idx = score, idx
-
-        # Phase 2: no moving elevator qualifies → look for idle elevator
-        if best_idx == -1:
-            idle_score = float('inf')
-            for idx in range(ELEVATOR_NUM):
-                if self.alerts[idx] or self.states[idx] != 0:
-                    continue
-                score = abs(self.floors[idx] - floor)
-                if score < idle_score:
-                    idle_score, best_idx = score, idx
-
-        # Phase 3: still none → pick nearest any-direction elevator
-        if best_idx == -1:
-            any_score = float('inf')
-            for idx in range(ELEVATOR_NUM):
-                if self.alerts[idx]:
-                    continue
-                score = abs(self.floors[idx] - floor)
-                if score < any_score:
-                    any_score, best_idx = score, idx
+        while pending:
+            batch, pending = pending[:len(cars)], pending[len(cars):]
+            cost = self.policy.batch_cost(self, batch, cars)
+            if cost is None:
+                for call in batch:
+                    elevator_id = self.assign_external(*call)
+                    for pos in positions[call]:
+                        result[pos] = elevator_id
+                continue
+            for (floor, direction), col in zip(batch, _min_cost_assignment(cost)):
+                idx = cars[col]
+                self._record_external(idx, floor, direction)
+                for pos in positions[(floor, direction)]:
+                    result[pos] = idx + 1
+        return result
 
-        if best_idx >= 0:
-            # Record the request for the chosen elevator
-            self.targets[best_idx].add(floor)
-            self.external_requests.add(floor)
-            # If already at the same floor, open the door immediately
-            if self.floors[best_idx] == floor:
-                self.opens[best_idx] = True
-            return best_idx + 1
+    def open_door(self, elevator_id: int) -> str:
+        """
+        Open the doors of an idle elevator.
+        Returns 'opened', or the reason it was refused: 'alert' or 'moving'.
+        """
+        idx = elevator_id - 1
+        if self.alerts[idx]:
+            return 'alert'
+        if self.states[idx] != 0:
+            return 'moving'
+        self.opens[idx] = True
+        return 'opened'
 
-        # No elevator available
-        return -1
+    def close_door(self, elevator_id: int) -> bool:
+        """
+        Close the doors of an idle elevator that is not in alert.
+        Returns True if the doors were closed.
+        """
+        idx = elevator_id - 1
+        if self.states[idx] == 0 and not self.alerts[idx]:
+            self.opens[idx] = False
+            return True
+        return False
 
-    def toggle_alert(self, elevator_id: int) -> bool:
+    def toggle_alert(self, elevator_id: int) -> tuple:
         """
         Toggle alert for one elevator.
-        If entering alert, reassign its external calls.
-        Returns new alert status.
+        If entering alert, reassign the hall calls it owns; those no other car
+        can take are dropped.
+        Returns (new alert status, dropped calls as (floor, direction) pairs).
         """
         idx = elevator_id - 1
         self.alerts[idx] = not self.alerts[idx]
-        if self.alerts[idx]:
-            # remove this elevator's pending external targets
-            pending = {f for f in self.targets[idx] if f in self.external_requests}
-            self.targets[idx] -= pending
-            # reassign all external requests
-            for floor in list(self.external_requests):
-                self.assign_external(floor)
-        return self.alerts[idx]
+        if not self.alerts[idx]:
+            self._index_add(idx)
+            return False, []
+        self._index_remove(idx, self.floors[idx], self.states[idx])
+        return True, self._reassign_hall_calls(idx)
+
+    def _reassign_hall_calls(self, idx: int) -> list:
+        """
+        Hand the hall calls owned by elevator idx to other cars, by floor.
+        Floors that are also car calls of idx stay among its targets.
+        Calls no car can take are dropped, with their call times.
+        Returns the dropped calls as (floor, direction) pairs.
+        """
+        calls = sorted((key for key, owner in self.hall_calls.items() if owner == idx),
+                       key=lambda key: (key[0], HALL_DIRECTIONS.index(key[1])))
+        for floor, direction in calls:
+            del self.hall_calls[(floor, direction)]
+            if floor not in self._car_times[idx]:
+                self._clear_target(idx, floor)
+        dropped = []
+        for floor, direction in calls:
+            if self.assign_external(floor, direction) < 0:
+                del self._hall_times[(floor, direction)]
+                dropped.append((floor, direction))
+        return dropped
+
+    def _set_target(self, idx: int, floor: int):
+        """
+        Add `floor` to the targets of elevator idx.
+        """
+        self.targets[idx] |= 1 << floor
+
+    def _clear_target(self, idx: int, floor: int):
+        """
+        Drop `floor` from the targets of elevator idx.
+        """
+        self.targets[idx] &= ~(1 << floor)
+
+
+def _bits(mask: int):
+    """
+    Yield the positions of the set bits of `mask` in ascending order.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _min_cost_assignment(cost) -> list:
+    """
+    Hungarian algorithm on an n x m cost matrix with n <= m.
+    Returns, for each row, the column assigned to it; the sum of the chosen
+    costs is minimal. Runs in O(n^2 * m).
+    """
+    n, m = len(cost), len(cost[0])
+    inf = float('inf')
+    # row/column potentials and column -> row matching, all 1-based
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    match = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        match[0] = row
+        col0 = 0
+        min_slack = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while match[col0] != 0:
+            used[col0] = True
+            row0 = match[col0]
+            costs = cost[row0 - 1]
+            delta = inf
+            col1 = 0
+            for col in range(1, m + 1):
+                if not used[col]:
+                    slack = costs[col - 1] - u[row0] - v[col]
+                    if slack < min_slack[col]:
+                        min_slack[col] = slack
+                        way[col] = col0
+                    if min_slack[col] < delta:
+                        delta = min_slack[col]
+                        col1 = col
+            for col in range(m + 1):
+                if used[col]:
+                    u[match[col]] += delta
+                    v[col] -= delta
+                else:
+                    min_slack[col] -= delta
+            col0 = col1
+        # augment along the alternating path
+        while col0:
+            col1 = way[col0]
+            match[col0] = match[col1]
+            col0 = col1
 
+    assignment = [0] * n
+    for col in range(1, m + 1):
+        if match[col]:
+            assignment[match[col] - 1] = col - 1
+    return assignment
@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import random
+import time
+
+from benchmark import percentile
+from dispatch import FLOOR_NUM, ELEVATOR_NUM
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+
+async def client(host: str, port: int, path: str, requests: int, floor_num: int,
+                 elevator_num: int, seed: int, latencies: list) -> int:
+    """
+    Send `requests` random hall and car calls over one connection, one at a
+    time, recording each round-trip latency in seconds.
+    Returns the number of error replies.
+    """
+    rng = random.Random(seed)
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    try:
+        for _ in range(requests):
+            floor = rng.randint(1, floor_num)
+            if rng.random() < 0.5:
+                line = f"external {floor} {rng.choice(('up', 'down'))}\n"
+            else:
+                line = f"internal {rng.randint(1, elevator_num)} {floor}\n"
+            start = time.perf_counter()
+            writer.write(line.encode())
+            reply = await reader.readline()
+            latencies.append(time.perf_counter() - start)
+            if not reply or reply.startswith(b"error"):
+                errors += 1
+    finally:
+        writer.close()
+    return errors
+
+
+async def run_load(connections: int, requests: int, host: str = DEFAULT_HOST,
+                   port: int = DEFAULT_PORT, path: str = None,
+                   floor_num: int = FLOOR_NUM, elevator_num: int = ELEVATOR_NUM,
+                   seed: int = 0) -> dict:
+    """
+    Open `connections` concurrent clients, each sending `requests` calls.
+    Returns throughput and round-trip latency statistics in milliseconds.
+    """
+    latencies = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(
+        client(host, port, path, requests, floor_num, elevator_num, seed + i, latencies)
+        for i in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    return {
+        "connections": connections,
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for server.py")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="connect to this Unix socket instead of TCP")
+    parser.add_argument("--connections", type=int, default=1000,
+                        help="concurrent client connections")
+    parser.add_argument("--requests", type=int, default=100, help="calls per connection")
+    parser.add_argument("--floors", type=int, default=FLOOR_NUM)
+    parser.add_argument("--elevators", type=int, default=ELEVATOR_NUM)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_load(args.connections, args.requests, args.host, args.port,
+                                 args.unix, args.floors, args.elevators, args.seed))
+    print(f"{stats['requests']:,} requests over {stats['connections']} connections "
+          f"in {stats['seconds']:.2f}s ({stats['requests_per_second']:,.0f} req/s, "
+          f"{stats['errors']} errors)")
+    print(f"latency mean {stats['mean_ms']:.2f} ms, p50 {stats['p50_ms']:.2f} ms, "
+          f"p99 {stats['p99_ms']:.2f} ms, max {stats['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from collections import deque
+from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtCore import QTimer
+
+# lines kept in memory and shown in the widget
+LOG_CAPACITY = 1000
+# ms between two flushes of buffered lines to the widget
+FLUSH_INTERVAL = 100
+
+
+class LogView(QPlainTextEdit):
+    """
+    Read-only event log backed by a fixed-size ring buffer.
+    `append` only buffers the line; a timer flushes all lines buffered since
+    the last flush to the widget in one batch, and the widget drops its
+    oldest lines beyond `capacity`. With `path`, every line is also streamed
+    to that file, so the full log survives the trimming.
+    """
+    def __init__(self, capacity: int = LOG_CAPACITY, flush_interval: int = FLUSH_INTERVAL,
+                 path: str = None, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(capacity)
+        self.capacity = capacity
+        self._lines = deque(maxlen=capacity)
+        # lines appended since the last flush, at most `capacity` are shown
+        self._pending = 0
+        self._stream = open(path, "a", encoding="utf-8") if path else None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def append(self, text: str):
+        """
+        Buffer one log line and schedule a flush.
+        """
+        self._lines.append(text)
+        self._pending += 1
+        if self._stream is not None:
+            self._stream.write(text + "\n")
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """
+        Show the buffered lines in the widget with a single append.
+        """
+        count = min(self._pending, len(self._lines))
+        self._pending = 0
+        if count:
+            self.appendPlainText("\n".join(list(self._lines)[-count:]))
+        if self._stream is not None:
+            self._stream.flush()
+
+    def lines(self) -> list:
+        """
+        Return the most recent `capacity` lines, oldest first.
+        """
+        return list(self._lines)
+
+    def clear(self):
+        """
+        Drop the buffered and shown lines; the file stream is kept.
+        """
+        self._lines.clear()
+        self._pending = 0
+        super().clear()
+
+    def close_stream(self):
+        """
+        Flush pending lines and close the file stream, if any.
+        """
+        self._flush_timer.stop()
+        self.flush()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
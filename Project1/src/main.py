@@ -1,12 +1,26 @@
 import sys
+import argparse
 from PyQt5.QtWidgets import QApplication
-from dispatch import Dispatcher
+from dispatch import Dispatcher, FLOOR_NUM, ELEVATOR_NUM, DWELL_TIME
+from policy import POLICIES
 from ui import ElevatorUI
 
 def main():
-    app = QApplication(sys.argv)
-    dispatcher = Dispatcher()
-    _ = ElevatorUI(dispatcher)
+    parser = argparse.ArgumentParser(description="Elevator dispatch simulation")
+    parser.add_argument("--floors", type=int, default=FLOOR_NUM, help="number of floors")
+    parser.add_argument("--elevators", type=int, default=ELEVATOR_NUM, help="number of elevators")
+    parser.add_argument("--dwell", type=int, default=DWELL_TIME, help="extra ticks doors stay open at a stop")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="three-phase",
+                        help="dispatch policy")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="simulation speed as a multiple of real time (0.1 to 1000)")
+    parser.add_argument("--log-file", help="also write the full event log to this file")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    dispatcher = Dispatcher(floor_num=args.floors, elevator_num=args.elevators,
+                            dwell_time=args.dwell, policy=args.policy)
+    _ = ElevatorUI(dispatcher, log_path=args.log_file, speed=args.speed)
     sys.exit(app.exec_())
 
 
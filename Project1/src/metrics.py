@@ -0,0 +1,110 @@
+class LatencyHistogram:
+    """
+    Histogram of integer latencies in ticks, one bucket per tick.
+    Values at or above `limit` share the last bucket.
+    """
+    def __init__(self, limit: int = 4096):
+        self.limit = limit
+        self.counts = [0] * (limit + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int):
+        self.counts[min(value, self.limit)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> int:
+        """
+        Smallest latency with at least q percent of the samples at or below it.
+        """
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for value, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return value
+        return self.limit
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class StepCounter:
+    """
+    Wall-clock duration of simulation steps in nanoseconds: count, total,
+    max and a power-of-two histogram (bucket b holds durations < 2**b ns).
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * 64
+
+    def record(self, ns: int):
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+        self.buckets[min(ns.bit_length(), 63)] += 1
+
+    def percentile(self, q: float) -> int:
+        """
+        Upper bound in ns of the bucket holding the q-th percentile.
+        """
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return 1 << bucket
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1000 if self.count else 0.0,
+            "p99_us": self.percentile(99) / 1000,
+            "max_us": self.max / 1000,
+        }
+
+
+class DispatcherMetrics:
+    """
+    Latency metrics of one Dispatcher: hall-call wait (call until a car opens
+    at the floor), car-call ride (request until the car opens at the target)
+    and per-tick step duration. Written by the simulation thread; readers
+    such as the UI take a `snapshot`.
+    """
+    def __init__(self):
+        self.hall_calls = 0
+        self.car_calls = 0
+        self.wait = LatencyHistogram()
+        self.ride = LatencyHistogram()
+        self.step = StepCounter()
+
+    def snapshot(self) -> dict:
+        return {
+            "hall_calls": self.hall_calls,
+            "car_calls": self.car_calls,
+            "wait": self.wait.summary(),
+            "ride": self.ride.summary(),
+            "step": self.step.summary(),
+        }
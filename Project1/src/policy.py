@@ -0,0 +1,180 @@
+class DispatchPolicy:
+    """
+    Strategy used by a Dispatcher to pick the car for an external call
+    (`select_car`, or `batch_cost` for a batch of calls) and the movement
+    direction of a car (`next_state`).
+    The default direction rule is LOOK: keep going while targets lie ahead,
+    reverse once none are left in the current direction.
+    """
+    name = ""
+
+    def select_car(self, dispatcher, floor: int, direction: str = None) -> int:
+        """
+        Return the 0-based index of the car to serve the call, or -1.
+        """
+        raise NotImplementedError
+
+    def batch_cost(self, dispatcher, calls: list, cars: list):
+        """
+        Cost of serving each (floor, direction) call in `calls` with each car
+        in `cars`, as a len(calls) x len(cars) matrix for a min-cost batch
+        assignment. None if the policy has no cost model; batches are then
+        assigned call by call through `select_car`.
+        """
+        return None
+
+    def next_state(self, dispatcher, idx: int) -> int:
+        """
+        Return the new movement state (-1, 0, 1) of car idx.
+        """
+        targets = dispatcher.targets[idx]
+        if dispatcher.alerts[idx] or not targets:
+            return 0
+
+        state = dispatcher.states[idx]
+        current = dispatcher.floors[idx]
+        highest = targets.bit_length() - 1
+        lowest = (targets & -targets).bit_length() - 1
+
+        if state == 0:
+            # idle: choose nearest target direction
+            if abs(highest - current) >= abs(lowest - current):
+                return -1 if lowest < current else 1
+            return 1 if highest > current else -1
+        if state == 1 and highest < current:
+            return -1
+        if state == -1 and lowest > current:
+            return 1
+        return state
+
+
+class ThreePhasePolicy(DispatchPolicy):
+    """
+    1) Prefer an elevator already moving in the same `direction` that will pass `floor`.
+    2) Otherwise, choose the nearest idle elevator.
+    3) Otherwise, choose the nearest any-direction elevator.
+    Each phase is a logarithmic lookup in the Dispatcher's candidate index;
+    ties go to the lowest elevator id.
+    """
+    name = "three-phase"
+
+    def select_car(self, dispatcher, floor: int, direction: str = None) -> int:
+        best_idx = -1
+
+        # Phase 1: elevators moving in same direction that will pass the floor
+        if direction == 'up':
+            entry = dispatcher._nearest_below(1, floor)
+            if entry is not None:
+                best_idx = entry[1]
+        elif direction == 'down':
+            entry = dispatcher._nearest_above(-1, floor, inclusive=True)
+            if entry is not None:
+                best_idx = entry[1]
+
+        # Phase 2: no moving elevator qualifies → look for idle elevator
+        if best_idx == -1:
+            best_idx = dispatcher._nearest((0,), floor)
+
+        # Phase 3: still none → pick nearest any-direction elevator
+        if best_idx == -1:
+            best_idx = dispatcher._nearest((-1, 0, 1), floor)
+
+        return best_idx
+
+
+class NearestCarPolicy(DispatchPolicy):
+    """
+    Nearest available car by floor distance, whatever its direction.
+    """
+    name = "nearest"
+
+    def select_car(self, dispatcher, floor: int, direction: str = None) -> int:
+        return dispatcher._nearest((-1, 0, 1), floor)
+
+
+class CollectivePolicy(DispatchPolicy):
+    """
+    Directional collective control: cars answer calls in their direction of
+    travel as they sweep the building. The call goes to the car that would
+    reach it first in a full sweep (terminal floor to terminal floor).
+    """
+    name = "collective"
+
+    def select_car(self, dispatcher, floor: int, direction: str = None) -> int:
+        top = dispatcher.floor_num
+        best_idx = -1
+        best_cost = float('inf')
+        for idx in range(dispatcher.elevator_num):
+            if dispatcher.alerts[idx]:
+                continue
+            current = dispatcher.floors[idx]
+            state = dispatcher.states[idx]
+            if state == 0:
+                cost = abs(current - floor)
+            elif state == 1:
+                if floor >= current and direction != 'down':
+                    cost = floor - current
+                elif direction != 'up':
+                    cost = (top - current) + (top - floor)
+                else:
+                    cost = (top - current) + (top - 1) + (floor - 1)
+            else:
+                if floor <= current and direction != 'up':
+                    cost = current - floor
+                elif direction != 'down':
+                    cost = (current - 1) + (floor - 1)
+                else:
+                    cost = (current - 1) + (top - 1) + (top - floor)
+            if cost < best_cost:
+                best_cost, best_idx = cost, idx
+        return best_idx
+
+
+class ScanPolicy(ThreePhasePolicy):
+    """
+    Three-phase car selection with SCAN direction control: a moving car runs
+    to the terminal floor before reversing, even with no targets ahead.
+    """
+    name = "scan"
+
+    def next_state(self, dispatcher, idx: int) -> int:
+        state = dispatcher.states[idx]
+        if state == 0 or dispatcher.alerts[idx] or not dispatcher.targets[idx]:
+            return DispatchPolicy.next_state(self, dispatcher, idx)
+        current = dispatcher.floors[idx]
+        if state == 1 and current >= dispatcher.floor_num:
+            return -1
+        if state == -1 and current <= 1:
+            return 1
+        return state
+
+
+class ETAPolicy(DispatchPolicy):
+    """
+    Car with the lowest estimated time of arrival (Dispatcher.eta), which
+    accounts for pending stops, dwell time and the current direction.
+    """
+    name = "eta"
+
+    def select_car(self, dispatcher, floor: int, direction: str = None) -> int:
+        return dispatcher._best_eta(floor, direction)
+
+    def batch_cost(self, dispatcher, calls: list, cars: list):
+        return [dispatcher._eta_row(floor, direction, cars) for floor, direction in calls]
+
+
+# policy name -> class
+POLICIES = {cls.name: cls for cls in (
+    ThreePhasePolicy, NearestCarPolicy, CollectivePolicy, ScanPolicy, ETAPolicy,
+)}
+
+
+def get_policy(policy) -> DispatchPolicy:
+    """
+    Resolve a policy name or instance to a DispatchPolicy instance.
+    """
+    if isinstance(policy, DispatchPolicy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError(f"{policy} is not accepted.")
+    return POLICIES[policy]()
@@ -0,0 +1,269 @@
+import argparse
+import asyncio
+import time
+from collections import deque
+
+from dispatch import Dispatcher, FLOOR_NUM, ELEVATOR_NUM, DWELL_TIME
+from policy import POLICIES
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# commands that take an elevator id (1-based) as their only argument
+CAR_COMMANDS = ('open', 'close', 'alert')
+# pending connections the listening socket queues, enough for a connect storm
+BACKLOG = 4096
+# most ticks one fast_forward may step, since it runs on the event loop
+MAX_FAST_FORWARD = 3600
+# bytes of unsent state lines after which a lagging subscriber is dropped
+SUBSCRIBER_BUFFER_LIMIT = 1 << 20
+
+
+def parse_command(line: str, dispatcher: Dispatcher) -> tuple:
+    """
+    Parse one request line into a Dispatcher command and its arguments:
+    `external FLOOR [up|down]`, `internal ELEVATOR FLOOR`, `open|close|alert
+    ELEVATOR` or `fast_forward TICKS` (at most MAX_FAST_FORWARD).
+    Raises ValueError on a bad request.
+    """
+    command, *words = line.split()
+    if command not in dispatcher.COMMANDS:
+        raise ValueError(f"unknown command {command}")
+    if command == 'external':
+        if not 1 <= len(words) <= 2:
+            raise ValueError("usage: external FLOOR [up|down]")
+        direction = words[1] if len(words) == 2 else None
+        if direction not in (None, 'up', 'down'):
+            raise ValueError(f"bad direction {direction}")
+        return command, (_floor(words[0], dispatcher), direction)
+    args = [int(word) for word in words]
+    if command == 'internal':
+        if len(args) != 2:
+            raise ValueError("usage: internal ELEVATOR FLOOR")
+        return command, (_car(args[0], dispatcher), _floor(args[1], dispatcher))
+    if len(args) != 1:
+        raise ValueError(f"usage: {command} " +
+                         ("ELEVATOR" if command in CAR_COMMANDS else "TICKS"))
+    if command in CAR_COMMANDS:
+        return command, (_car(args[0], dispatcher),)
+    if not 0 <= args[0] <= MAX_FAST_FORWARD:
+        raise ValueError(f"bad tick count {args[0]}, at most {MAX_FAST_FORWARD}")
+    return command, (args[0],)
+
+
+def _floor(value, dispatcher: Dispatcher) -> int:
+    floor = int(value)
+    if not 1 <= floor <= dispatcher.floor_num:
+        raise ValueError(f"no floor {floor}")
+    return floor
+
+
+def _car(value, dispatcher: Dispatcher) -> int:
+    elevator_id = int(value)
+    if not 1 <= elevator_id <= dispatcher.elevator_num:
+        raise ValueError(f"no elevator {elevator_id}")
+    return elevator_id
+
+
+def _format_result(command: str, result) -> str:
+    """
+    Reply text for a command result; `alert` answers its new status followed
+    by each dropped hall call as FLOOR:DIRECTION (`-` for no direction).
+    """
+    if command == 'alert':
+        alerted, dropped = result
+        return " ".join([str(alerted)] +
+                        [f"{floor}:{direction or '-'}" for floor, direction in dropped])
+    return str(result)
+
+
+class DispatchServer:
+    """
+    Asyncio front-end that feeds hall and car calls received over a TCP or
+    Unix socket into a Dispatcher stepped on the event loop.
+    Clients send one command per line (see `parse_command`) and get one reply
+    line per command, in order: the command name and its result, or `error`
+    and a message. A client that sends `subscribe` instead receives a
+    `state CLOCK ELEVATOR FLOOR STATE OPEN ALERT` line for every car that
+    changed after each tick; one that falls more than
+    SUBSCRIBER_BUFFER_LIMIT bytes behind is disconnected. Commands go through
+    the Dispatcher command queue; all requests arriving in one loop iteration
+    are drained together.
+    """
+    def __init__(self, dispatcher: Dispatcher, speed: float = 1.0):
+        self.dispatcher = dispatcher
+        # seconds between ticks, one tick is one virtual second
+        self.interval = 1.0 / speed
+        # (writer, error) per request awaiting its reply, in arrival order;
+        # error is None for a queued command, whose result comes from the drain
+        self._replies = deque()
+        self._drain_scheduled = False
+        self.subscribers = set()
+        # last broadcast (floor, state, open, alert) per car
+        self._shown = [None] * dispatcher.elevator_num
+        self.requests = 0
+        self._server = None
+        self._ticker = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    path: str = None):
+        """
+        Listen on `path` (a Unix socket) if given, else on host:port, and
+        start stepping the simulation.
+        """
+        if path:
+            self._server = await asyncio.start_unix_server(self._handle, path, backlog=BACKLOG)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port,
+                                                      backlog=BACKLOG)
+        self._ticker = asyncio.create_task(self._run())
+        return self._server
+
+    async def close(self):
+        self._ticker.cancel()
+        self._server.close()
+        for writer in list(self.subscribers):
+            writer.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve one client connection until it disconnects.
+        """
+        try:
+            async for raw in reader:
+                line = raw.decode(errors="replace").strip()
+                if not line:
+                    continue
+                if line == "subscribe":
+                    self.subscribers.add(writer)
+                    # resend every car so the new subscriber starts from a full view
+                    self._shown = [None] * self.dispatcher.elevator_num
+                    continue
+                try:
+                    command, args = parse_command(line, self.dispatcher)
+                except ValueError as e:
+                    if self._replies:
+                        # answer after the commands still queued before it
+                        self._replies.append((writer, f"error {e}\n"))
+                    else:
+                        writer.write(f"error {e}\n".encode())
+                else:
+                    self.dispatcher.submit(command, *args)
+                    self._replies.append((writer, None))
+                    self._schedule_drain()
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    def _schedule_drain(self):
+        """
+        Drain the command queue once the current batch of reads is handled.
+        """
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            asyncio.get_running_loop().call_soon(self._drain)
+
+    def _drain(self):
+        """
+        Apply queued commands and send each result, and the errors queued
+        between them, to their clients.
+        """
+        self._drain_scheduled = False
+        replies = self._replies
+        for command, _, result in self.dispatcher.drain_commands():
+            writer, error = replies.popleft()
+            while error is not None:
+                self._reply(writer, error)
+                writer, error = replies.popleft()
+            self.requests += 1
+            self._reply(writer, f"{command} {_format_result(command, result)}\n")
+        while replies:
+            self._reply(*replies.popleft())
+
+    @staticmethod
+    def _reply(writer: asyncio.StreamWriter, line: str):
+        if not writer.is_closing():
+            writer.write(line.encode())
+
+    async def _run(self):
+        """
+        Step the dispatcher once per tick against absolute deadlines.
+        """
+        deadline = time.monotonic()
+        while True:
+            self._drain()
+            self.dispatcher.step_all()
+            if self.subscribers:
+                self._broadcast()
+            deadline += self.interval
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                # fell behind: restart the cadence instead of bursting
+                deadline -= delay
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def _broadcast(self):
+        """
+        Send the cars whose state changed in the last tick to all subscribers,
+        dropping those that do not keep up.
+        """
+        d = self.dispatcher
+        lines = []
+        for idx in range(d.elevator_num):
+            shown = (int(d.floors[idx]), int(d.states[idx]), bool(d.opens[idx]),
+                     bool(d.alerts[idx]))
+            if shown != self._shown[idx]:
+                self._shown[idx] = shown
+                floor, state, is_open, alert = shown
+                lines.append(f"state {d.clock} {idx + 1} {floor} {state} "
+                             f"{int(is_open)} {int(alert)}\n")
+        if lines:
+            data = "".join(lines).encode()
+            for writer in list(self.subscribers):
+                if writer.is_closing():
+                    self.subscribers.discard(writer)
+                elif writer.transport.get_write_buffer_size() > SUBSCRIBER_BUFFER_LIMIT:
+                    self.subscribers.discard(writer)
+                    writer.close()
+                else:
+                    writer.write(data)
+
+
+async def serve(dispatcher: Dispatcher, speed: float, host: str, port: int,
+                path: str = None):
+    server = DispatchServer(dispatcher, speed)
+    await server.start(host, port, path)
+    print(f"Serving {dispatcher.elevator_num} elevators over {dispatcher.floor_num} floors "
+          f"on {path or f'{host}:{port}'}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Network front-end for the elevator dispatcher")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--floors", type=int, default=FLOOR_NUM)
+    parser.add_argument("--elevators", type=int, default=ELEVATOR_NUM)
+    parser.add_argument("--dwell", type=int, default=DWELL_TIME)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="three-phase")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="simulation speed as a multiple of real time")
+    args = parser.parse_args()
+
+    dispatcher = Dispatcher(args.floors, args.elevators, args.dwell, args.policy)
+    try:
+        asyncio.run(serve(dispatcher, args.speed, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import heapq
+import random
+import time
+from itertools import count
+
+from dispatch import Dispatcher
+
+
+class Simulation:
+    """
+    Headless discrete-event engine that drives a Dispatcher on a virtual clock.
+    One tick equals one virtual second, the time an elevator needs per floor.
+    Calls are kept in an event queue and applied when the clock reaches them.
+    """
+    def __init__(self, dispatcher: Dispatcher = None, batch_calls: bool = False):
+        self.dispatcher = dispatcher if dispatcher is not None else Dispatcher()
+        # assign all external calls of a tick together via assign_external_batch
+        self.batch_calls = batch_calls
+        self._hall_calls = []
+        # virtual clock in ticks, continuing the dispatcher's (e.g. restored) clock
+        self.now = self.dispatcher.clock
+        # number of ticks actually stepped (idle gaps are skipped)
+        self.steps = 0
+        # heap of (time, seq, action, args); seq keeps FIFO order per tick
+        self._events = []
+        self._seq = count()
+        # callables run as observer(sim) after every step, before the clock advances
+        self.observers = []
+
+    def schedule(self, at: int, action, *args):
+        """
+        Queue `action(*args)` to run at virtual time `at` (before that tick's step).
+        """
+        if at < self.now:
+            raise ValueError(f"Cannot schedule event in the past: {at} < {self.now}")
+        heapq.heappush(self._events, (at, next(self._seq), action, args))
+
+    def call_external(self, at: int, floor: int, direction: str = None):
+        """
+        Queue an external up/down call at `floor`.
+        """
+        self.schedule(at, self.hall_call, floor, direction)
+
+    def hall_call(self, floor: int, direction: str = None):
+        """
+        Apply an external call now, or hold it for this tick's batch.
+        """
+        if self.batch_calls:
+            self._hall_calls.append((floor, direction))
+        else:
+            self.dispatcher.assign_external(floor, direction)
+
+    def call_internal(self, at: int, elevator_id: int, floor: int):
+        """
+        Queue an internal request inside elevator `elevator_id` (1-based).
+        """
+        self.schedule(at, self.dispatcher.assign_internal, elevator_id, floor)
+
+    def pending(self) -> int:
+        """
+        Number of events not yet applied.
+        """
+        return len(self._events)
+
+    def tick(self):
+        """
+        Apply events due at the current time, step all elevators, advance clock.
+        """
+        events = self._events
+        while events and events[0][0] <= self.now:
+            _, _, action, args = heapq.heappop(events)
+            action(*args)
+        if self._hall_calls:
+            self.dispatcher.assign_external_batch(self._hall_calls)
+            self._hall_calls = []
+        self.dispatcher.step_all()
+        self.steps += 1
+        for observer in self.observers:
+            observer(self)
+        self.now += 1
+
+    def run_until(self, end: int):
+        """
+        Run until the clock reaches `end`.
+        While the building is idle, jump straight to the next event.
+        """
+        events = self._events
+        dispatcher = self.dispatcher
+        while self.now < end:
+            if dispatcher.is_idle():
+                if not events:
+                    self.now = dispatcher.clock = end
+                    break
+                if events[0][0] > self.now:
+                    self.now = min(events[0][0], end)
+                    dispatcher.clock = self.now
+                    continue
+            self.tick()
+
+    def run(self, ticks: int):
+        """
+        Run for `ticks` virtual seconds from the current time.
+        """
+        self.run_until(self.now + ticks)
+
+
+def random_calls(sim: Simulation, duration: int, rate: float, seed: int = 0):
+    """
+    Schedule random external calls over `duration` ticks, Poisson with on
+    average `rate` per tick, each paired with an internal request in a random
+    elevator.
+    """
+    if rate <= 0:
+        raise ValueError(f"Call rate must be positive, got {rate}.")
+    rng = random.Random(seed)
+    floor_num = sim.dispatcher.floor_num
+    elevator_num = sim.dispatcher.elevator_num
+    end = sim.now + duration
+    at = sim.now + rng.expovariate(rate)
+    while at < end:
+        floor = rng.randint(1, floor_num)
+        target = rng.randint(1, floor_num)
+        direction = 'up' if target > floor else 'down'
+        sim.call_external(int(at), floor, direction)
+        sim.call_internal(int(at), rng.randint(1, elevator_num), target)
+        at += rng.expovariate(rate)
+
+
+if __name__ == "__main__":
+    sim = Simulation()
+    random_calls(sim, duration=100_000, rate=0.3)
+    start = time.perf_counter()
+    sim.run(100_000)
+    elapsed = time.perf_counter() - start
+    print(f"{sim.steps} ticks in {elapsed:.2f}s "
+          f"({sim.steps / elapsed:,.0f} ticks/s)")
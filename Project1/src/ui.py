@@ -2,192 +2,393 @@ import sys
 from functools import partial
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QGridLayout, QPushButton,
-    QLCDNumber, QTextEdit, QTextBrowser
+    QLCDNumber, QTextBrowser, QScrollBar, QComboBox, QSpinBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 
-from dispatch import Dispatcher, ELEVATOR_NUM, FLOOR_NUM
-from base import ElevatorThread
+from dispatch import Dispatcher
+from base import SchedulerThread, MIN_SPEED, MAX_SPEED
+from log_view import LogView
+
+VISIBLE_FLOORS = 20
+VISIBLE_ELEVATORS = 5
+# minimum ms between two repaints (one 60 Hz display frame)
+FRAME_INTERVAL = 16
+# simulation speeds offered in the speed box, x real time
+SPEEDS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 100, 1000]
+# state label text and style sheet, by display state
+STATE_STYLES = {
+    'alert': ("Stall", "background:red; color:yellow;"),
+    'open': ("Open", "background:white; color:#5CB3CC;"),
+    1: ("↑", "background:black; color:#93D5DC;"),
+    -1: ("↓", "background:black; color:#93D5DC;"),
+    0: ("Stay", "background:black; color:#93D5DC;"),
+}
 
 
 class ElevatorUI(QWidget):
     """
     Main window for elevator dispatch simulation.
+    Only a window of `visible_floors` x `visible_elevators` is built as widgets;
+    scroll bars move the window over the building and relabel the widgets,
+    so startup and repaint cost do not grow with the building size.
+    Scheduler ticks only mark the view dirty; a frame timer repaints at most
+    once per FRAME_INTERVAL and only touches cars whose display changed.
     """
-    def __init__(self, dispatcher: Dispatcher):
+    def __init__(self, dispatcher: Dispatcher, visible_floors: int = VISIBLE_FLOORS,
+                 visible_elevators: int = VISIBLE_ELEVATORS, log_path: str = None,
+                 speed: float = 1.0):
         super().__init__()
         self.dispatcher = dispatcher
+        self.visible_floors = min(visible_floors, dispatcher.floor_num)
+        self.visible_elevators = min(visible_elevators, dispatcher.elevator_num)
+        # first visible floor / elevator, both 0-based
+        self.floor_offset = 0
+        self.elevator_offset = 0
         self.info_log = None
-        self.threads = []
+        self.log_path = log_path
+        self.speed = min(max(speed, MIN_SPEED), MAX_SPEED)
+        self.scheduler = None
+        # coalesces scheduler ticks into at most one repaint per frame
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(FRAME_INTERVAL)
+        self._frame_timer.timeout.connect(self._update_all)
         self._setup_ui()
-        self._start_threads()
+        self._start_scheduler()
 
     def _setup_ui(self):
         """
         Set up UI layout: labels, displays, buttons, log and exit.
+        Widgets are addressed by visible column/row, not by elevator/floor.
         """
         grid = QGridLayout()
+        cols = self.visible_elevators
+        rows = self.visible_floors
+        self.elevator_labels = []
+        self.internal_buttons = []
+        self.external_buttons = []
+        self.lcds = []
+        self.state_labels = []
+        # last rendered (floor, display state) per column, None = repaint
+        self._shown = [None] * cols
+        self._metrics_text = ""
 
         # 1) Elevator labels
-        for i in range(ELEVATOR_NUM):
-            lbl = QLabel(f"Elevator {i + 1}")
+        for col in range(cols):
+            lbl = QLabel()
             lbl.setAlignment(Qt.AlignCenter)
             lbl.setFont(QFont("Times new roman", 14))
-            grid.addWidget(lbl, 0, i, 1, 1)
+            grid.addWidget(lbl, 0, col, 1, 1)
+            self.elevator_labels.append(lbl)
 
         # 2) LCD display and state label
-        for i in range(ELEVATOR_NUM):
+        for col in range(cols):
             lcd = QLCDNumber()
-            lcd.setObjectName(f"elevatorLCD{i + 1}")
-            lcd.setDigitCount(2)
+            lcd.setObjectName(f"elevatorLCD{col + 1}")
+            lcd.setDigitCount(len(str(self.dispatcher.floor_num)))
             lcd.display(1)
-            grid.addWidget(lcd, 1, i, 1, 1)
+            grid.addWidget(lcd, 1, col, 1, 1)
+            self.lcds.append(lcd)
 
             state_lbl = QLabel("Stay")
-            state_lbl.setObjectName(f"elevatorState{i + 1}")
+            state_lbl.setObjectName(f"elevatorState{col + 1}")
             state_lbl.setAlignment(Qt.AlignCenter)
             state_lbl.setFont(QFont("Times new roman", 12))
             state_lbl.setStyleSheet("background:black; color:#93D5DC;")
-            grid.addWidget(state_lbl, 2, i, 1, 1)
+            grid.addWidget(state_lbl, 2, col, 1, 1)
+            self.state_labels.append(state_lbl)
 
         # 3) Internal floor buttons
-        for eid in range(1, ELEVATOR_NUM + 1):
-            for floor in range(1, FLOOR_NUM + 1):
-                btn = QPushButton(f"{floor}F")
-                btn.clicked.connect(partial(self._on_internal, eid, floor))
-                grid.addWidget(btn, floor + 2, eid - 1, 1, 1)
+        for col in range(cols):
+            column = []
+            for row in range(rows):
+                btn = QPushButton()
+                btn.clicked.connect(partial(self._on_internal_cell, col, row))
+                grid.addWidget(btn, row + 3, col, 1, 1)
+                column.append(btn)
+            self.internal_buttons.append(column)
 
         # 4) OPEN / CLOSE / ALERT buttons
-        for eid in range(1, ELEVATOR_NUM + 1):
+        base_row = rows + 3
+        for col in range(cols):
             o_btn = QPushButton("OPEN")
-            o_btn.clicked.connect(partial(self._on_open, eid))
+            o_btn.clicked.connect(partial(self._on_column, self._on_open, col))
             c_btn = QPushButton("CLOSE")
-            c_btn.clicked.connect(partial(self._on_close, eid))
+            c_btn.clicked.connect(partial(self._on_column, self._on_close, col))
             a_btn = QPushButton("ALERT")
-            a_btn.clicked.connect(partial(self._on_alert, eid))
-            base_row = FLOOR_NUM + 3
-            grid.addWidget(o_btn, base_row, eid - 1, 1, 1)
-            grid.addWidget(c_btn, base_row + 1, eid - 1, 1, 1)
-            grid.addWidget(a_btn, base_row + 2, eid - 1, 1, 1)
+            a_btn.clicked.connect(partial(self._on_column, self._on_alert, col))
+            grid.addWidget(o_btn, base_row, col, 1, 1)
+            grid.addWidget(c_btn, base_row + 1, col, 1, 1)
+            grid.addWidget(a_btn, base_row + 2, col, 1, 1)
 
         # 5) External up/down buttons
-        for floor in range(1, FLOOR_NUM + 1):
-            up = QPushButton(f"▲ {floor}F")
-            up.clicked.connect(partial(self._on_external, floor, "up"))
-            grid.addWidget(up, floor + 4, ELEVATOR_NUM, 1, 1)
-            down = QPushButton(f"▼ {floor}F")
-            down.clicked.connect(partial(self._on_external, floor, "down"))
-            grid.addWidget(down, floor + 4, ELEVATOR_NUM + 1, 1, 1)
-
-        # 6) Information log
-        self.info_log = QTextEdit()
-        self.info_log.setReadOnly(True)
-        grid.addWidget(self.info_log, 1, ELEVATOR_NUM, 4, 2)
-
-        # 7) Notes
-        note = QTextBrowser()
-        note.setText("Elevator simulation")
-        grid.addWidget(note, 0, ELEVATOR_NUM, 1, 2)
-
-        # 8) Exit button
+        for row in range(rows):
+            up = QPushButton()
+            up.clicked.connect(partial(self._on_external_row, row, "up"))
+            grid.addWidget(up, row + 5, cols, 1, 1)
+            down = QPushButton()
+            down.clicked.connect(partial(self._on_external_row, row, "down"))
+            grid.addWidget(down, row + 5, cols + 1, 1, 1)
+            self.external_buttons.append((up, down))
+
+        # 6) Scroll bars, only when the building exceeds the visible window
+        if self.dispatcher.floor_num > rows:
+            v_bar = QScrollBar(Qt.Vertical)
+            v_bar.setRange(0, self.dispatcher.floor_num - rows)
+            v_bar.setPageStep(rows)
+            v_bar.valueChanged.connect(self._on_floor_scroll)
+            grid.addWidget(v_bar, 3, cols + 2, rows + 3, 1)
+        if self.dispatcher.elevator_num > cols:
+            h_bar = QScrollBar(Qt.Horizontal)
+            h_bar.setRange(0, self.dispatcher.elevator_num - cols)
+            h_bar.setPageStep(cols)
+            h_bar.valueChanged.connect(self._on_elevator_scroll)
+            grid.addWidget(h_bar, base_row + 3, 0, 1, cols)
+
+        # 7) Information log
+        self.info_log = LogView(path=self.log_path)
+        grid.addWidget(self.info_log, 1, cols, 4, 2)
+
+        # 8) Notes
+        self.note = QTextBrowser()
+        grid.addWidget(self.note, 0, cols, 1, 2)
+        self._update_metrics()
+
+        # 9) Exit button
         exit_button = QPushButton("Exit")
         exit_button.setStyleSheet("background-color: red; color: white; font-weight: bold;")
         exit_button.clicked.connect(self.close)
-        grid.addWidget(exit_button, FLOOR_NUM + 4, ELEVATOR_NUM, 1, 2)
+        grid.addWidget(exit_button, rows + 5, cols, 1, 2)
+
+        # 10) Simulation speed and fast-forward
+        self.speed_box = QComboBox()
+        speeds = sorted(set(SPEEDS) | {self.speed})
+        self.speed_box.addItems([f"{speed:g}×" for speed in speeds])
+        self.speed_box.setCurrentIndex(speeds.index(self.speed))
+        self.speed_box.currentIndexChanged.connect(
+            lambda index: self._on_speed(speeds[index]))
+        grid.addWidget(self.speed_box, rows + 6, cols, 1, 2)
+        self.forward_spin = QSpinBox()
+        self.forward_spin.setRange(1, 86400)
+        self.forward_spin.setValue(600)
+        self.forward_spin.setSuffix(" s")
+        grid.addWidget(self.forward_spin, rows + 7, cols, 1, 1)
+        forward_button = QPushButton("Fast-forward")
+        forward_button.clicked.connect(self._on_fast_forward)
+        grid.addWidget(forward_button, rows + 7, cols + 1, 1, 1)
 
+        self._relabel()
         self.setLayout(grid)
         self.setWindowTitle("Elevator Dispatch Simulation")
         self.resize(1300, 700)
         self.show()
 
-    def _start_threads(self):
+    def _relabel(self):
+        """
+        Refresh the texts of the widget window after it moved over the building.
+        """
+        for col, lbl in enumerate(self.elevator_labels):
+            lbl.setText(f"Elevator {self.elevator_offset + col + 1}")
+        for row in range(self.visible_floors):
+            floor = self.floor_offset + row + 1
+            for column in self.internal_buttons:
+                column[row].setText(f"{floor}F")
+            up, down = self.external_buttons[row]
+            up.setText(f"▲ {floor}F")
+            down.setText(f"▼ {floor}F")
+
+    def _on_floor_scroll(self, value: int):
         """
-        Start background threads for each elevator.
+        Move the visible window to start at floor `value + 1`.
         """
-        for idx in range(ELEVATOR_NUM):
-            thread = ElevatorThread(self.dispatcher, idx)
-            thread.update_signal.connect(self._update_ui)
-            thread.start()
-            self.threads.append(thread)
+        self.floor_offset = value
+        self._relabel()
+
+    def _on_elevator_scroll(self, value: int):
+        """
+        Move the visible window to start at elevator `value + 1`.
+        """
+        self.elevator_offset = value
+        self._relabel()
+        self._shown = [None] * self.visible_elevators
+        self._update_all()
+
+    def _start_scheduler(self):
+        """
+        Start the single background scheduler that steps all elevators.
+        """
+        self.scheduler = SchedulerThread(self.dispatcher, self.speed)
+        self.scheduler.update_signal.connect(self._schedule_repaint)
+        self.scheduler.command_signal.connect(self._on_commands_applied)
+        self.scheduler.start()
 
     def closeEvent(self, event):
         """
-        Called when window closes: request threads to stop, then wait for them.
+        Called when window closes: request the scheduler to stop, then wait for it.
         """
-        for thread in self.threads:
-            thread.requestInterruption()
-            thread.wait()
+        self.scheduler.requestInterruption()
+        self.scheduler.wait()
+        self.info_log.close_stream()
         event.accept()
 
+    def _schedule_repaint(self):
+        """
+        Mark the view dirty after a scheduler tick; ticks arriving before the
+        next frame share its repaint.
+        """
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    def _update_all(self):
+        """
+        Refresh the visible elevators and the metrics panel.
+        """
+        first = self.elevator_offset + 1
+        for elevator_id in range(first, first + self.visible_elevators):
+            self._update_ui(elevator_id)
+        self._update_metrics()
+
+    def _update_metrics(self):
+        """
+        Show the Dispatcher's latency metrics in the notes panel.
+        """
+        metrics = self.dispatcher.metrics.snapshot()
+        wait, ride, step = metrics["wait"], metrics["ride"], metrics["step"]
+        text = (
+            f"Elevator simulation: {self.dispatcher.floor_num} floors, "
+            f"{self.dispatcher.elevator_num} elevators\n"
+            f"Wait: avg {wait['mean']:.1f}s, p95 {wait['p95']}s, p99 {wait['p99']}s | "
+            f"Ride: avg {ride['mean']:.1f}s, p95 {ride['p95']}s | "
+            f"Step: {step['mean_us']:.0f}µs"
+        )
+        if text != self._metrics_text:
+            self._metrics_text = text
+            self.note.setText(text)
+
     def _update_ui(self, elevator_id: int):
         """
-        Update the UI elements for one elevator.
+        Update the UI elements for one elevator, if it is visible and its
+        floor or display state changed since the last repaint.
         """
         idx = elevator_id - 1
-        lcd = self.findChild(QLCDNumber, f"elevatorLCD{elevator_id}")
-        lcd.display(self.dispatcher.floors[idx])
-
-        lbl = self.findChild(QLabel, f"elevatorState{elevator_id}")
+        col = idx - self.elevator_offset
+        if not 0 <= col < self.visible_elevators:
+            return
+        floor = int(self.dispatcher.floors[idx])
         if self.dispatcher.alerts[idx]:
-            lbl.setText("Stall")
-            lbl.setStyleSheet("background:red; color:yellow;")
+            state = 'alert'
         elif self.dispatcher.opens[idx]:
-            lbl.setText("Open")
-            lbl.setStyleSheet("background:white; color:#5CB3CC;")
+            state = 'open'
         else:
-            st = self.dispatcher.states[idx]
-            lbl.setText("↑" if st == 1 else "↓" if st == -1 else "Stay")
-            lbl.setStyleSheet("background:black; color:#93D5DC;")
+            state = int(self.dispatcher.states[idx])
+        shown = self._shown[col]
+        if shown is None or shown[0] != floor:
+            self.lcds[col].display(floor)
+        if shown is None or shown[1] != state:
+            text, style = STATE_STYLES[state]
+            lbl = self.state_labels[col]
+            lbl.setText(text)
+            lbl.setStyleSheet(style)
+        self._shown[col] = (floor, state)
+
+    def _on_internal_cell(self, col: int, row: int):
+        """
+        Map a clicked internal button in the visible window to elevator and floor.
+        """
+        self._on_internal(self.elevator_offset + col + 1, self.floor_offset + row + 1)
+
+    def _on_external_row(self, row: int, direction: str):
+        """
+        Map a clicked external button in the visible window to its floor.
+        """
+        self._on_external(self.floor_offset + row + 1, direction)
+
+    def _on_column(self, handler, col: int):
+        """
+        Call an elevator button handler for the elevator shown in column `col`.
+        """
+        handler(self.elevator_offset + col + 1)
 
     def _on_internal(self, elevator_id: int, floor: int):
         """
         Handle internal request button.
         """
-        self.dispatcher.assign_internal(elevator_id, floor)
-        self.info_log.append(f"Elevator {elevator_id} scheduled to go to floor {floor}")
+        self.dispatcher.submit('internal', elevator_id, floor)
 
     def _on_external(self, floor: int, direction: str):
         """
         Handle external up/down request button.
         """
-        eid = self.dispatcher.assign_external(floor, direction)
-        if eid > 0:
-            self.info_log.append(f"External {direction} call at {floor}F → Elevator {eid}")
-        else:
-            self.info_log.append(f"No available elevator for external call at {floor}F")
+        self.dispatcher.submit('external', floor, direction)
 
     def _on_open(self, elevator_id: int):
         """
         Handle open button: only works if elevator is idle and not in alert.
         """
-        idx = elevator_id - 1
-        if self.dispatcher.alerts[idx]:
-            self.info_log.append(f"Elevator {elevator_id} is in ALERT state; cannot open doors.")
-            return
-        if self.dispatcher.states[idx] != 0:
-            self.info_log.append(f"Elevator {elevator_id} is moving; cannot open doors.")
-            return
-        self.dispatcher.opens[idx] = True
-        self.info_log.append(f"Elevator {elevator_id} door open requested")
-        self._update_ui(elevator_id)
+        self.dispatcher.submit('open', elevator_id)
 
     def _on_close(self, elevator_id: int):
         """
         Handle close button: only works if elevator is idle and not in alert.
         """
-        idx = elevator_id - 1
-        if self.dispatcher.states[idx] == 0 and not self.dispatcher.alerts[idx]:
-            self.dispatcher.opens[idx] = False
-            self.info_log.append(f"Elevator {elevator_id} door close requested")
-            self._update_ui(elevator_id)
+        self.dispatcher.submit('close', elevator_id)
 
     def _on_alert(self, elevator_id: int):
         """
         Toggle alert mode for the elevator.
         """
-        new_status = self.dispatcher.toggle_alert(elevator_id)
-        if new_status:
-            self.info_log.append(f"Elevator {elevator_id} entered ALERT; reassigning calls")
-        else:
-            self.info_log.append(f"Elevator {elevator_id} alert cleared")
+        self.dispatcher.submit('alert', elevator_id)
+
+    def _on_speed(self, speed: float):
+        """
+        Change how many virtual seconds pass per real second.
+        """
+        self.speed = speed
+        self.scheduler.set_speed(speed)
+        self.info_log.append(f"Simulation speed set to {speed:g}×")
+
+    def _on_fast_forward(self):
+        """
+        Jump the simulation ahead without rendering the skipped ticks.
+        """
+        self.dispatcher.submit('fast_forward', self.forward_spin.value())
+
+    def _on_commands_applied(self, results: list):
+        """
+        Log the outcome of a batch of commands applied by the scheduler.
+        """
+        for command, args, result in results:
+            if command == 'internal':
+                elevator_id, floor = args
+                self.info_log.append(f"Elevator {elevator_id} scheduled to go to floor {floor}")
+            elif command == 'external':
+                floor, direction = args
+                if result > 0:
+                    self.info_log.append(f"External {direction} call at {floor}F → Elevator {result}")
+                else:
+                    self.info_log.append(f"No available elevator for external call at {floor}F")
+            elif command == 'open':
+                elevator_id, = args
+                if result == 'alert':
+                    self.info_log.append(f"Elevator {elevator_id} is in ALERT state; cannot open doors.")
+                elif result == 'moving':
+                    self.info_log.append(f"Elevator {elevator_id} is moving; cannot open doors.")
+                else:
+                    self.info_log.append(f"Elevator {elevator_id} door open requested")
+            elif command == 'close':
+                elevator_id, = args
+                if result:
+                    self.info_log.append(f"Elevator {elevator_id} door close requested")
+            elif command == 'alert':
+                elevator_id, = args
+                alerted, dropped = result
+                if alerted:
+                    self.info_log.append(f"Elevator {elevator_id} entered ALERT; reassigning calls")
+                    for floor, direction in dropped:
+                        self.info_log.append(f"No available elevator for external call at {floor}F")
+                else:
+                    self.info_log.append(f"Elevator {elevator_id} alert cleared")
+            elif command == 'fast_forward':
+                self.info_log.append(f"Fast-forwarded {result} s to t={self.dispatcher.clock} s")
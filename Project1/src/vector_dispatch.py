@@ -0,0 +1,310 @@
+from time import perf_counter_ns
+
+import numpy as np
+
+from dispatch import Dispatcher, FLOOR_NUM, ELEVATOR_NUM, DWELL_TIME, _bits
+
+
+class VectorDispatcher(Dispatcher):
+    """
+    Array-backed Dispatcher: per-elevator state lives in NumPy arrays and
+    targets in a boolean elevator x floor matrix, so `step_all` advances
+    every elevator in one vectorized pass. Same behavior as Dispatcher.
+    The fixed cost of each NumPy call makes it slower than Dispatcher for
+    small fleets; it pays off from roughly 100 elevators on.
+    Only the policies vectorized below are supported, all with LOOK direction.
+    """
+    VECTOR_POLICIES = ("three-phase", "eta")
+
+    def __init__(self, floor_num: int = FLOOR_NUM, elevator_num: int = ELEVATOR_NUM,
+                 dwell_time: int = DWELL_TIME, policy="three-phase"):
+        super().__init__(floor_num, elevator_num, dwell_time, policy)
+        if self.policy.name not in self.VECTOR_POLICIES:
+            raise ValueError(f"{self.policy.name} is not supported by VectorDispatcher.")
+        self.floors = np.ones(elevator_num, dtype=np.int64)
+        # targets[idx, floor]; column 0 is unused so floors index directly
+        self.targets = np.zeros((elevator_num, floor_num + 1), dtype=bool)
+        self.states = np.zeros(elevator_num, dtype=np.int64)
+        self.alerts = np.zeros(elevator_num, dtype=bool)
+        self.opens = np.zeros(elevator_num, dtype=bool)
+        self._holds = np.zeros(elevator_num, dtype=np.int64)
+        self._travel = np.array(self._travel, dtype=np.int64)
+        self._dwell = np.array(self._dwell, dtype=np.int64)
+        self._cars = np.arange(elevator_num)
+        self._floor_ids = np.arange(floor_num + 1)
+
+    def update_elevator(self, idx: int):
+        """
+        Step one elevator (0-based idx) on the array state.
+        """
+        if self.alerts[idx]:
+            return
+        if self._holds[idx]:
+            self._holds[idx] -= 1
+            return
+        if self.states[idx] == -1 and self.floors[idx] > 1:
+            self.floors[idx] -= 1
+        elif self.states[idx] == 1 and self.floors[idx] < self.floor_num:
+            self.floors[idx] += 1
+
+        floor = int(self.floors[idx])
+        opened = False
+        if self.targets[idx, floor]:
+            opened = self._stop_at(idx, floor)
+        self.opens[idx] = opened
+        if opened:
+            self._holds[idx] = self._dwell[floor]
+        self._update_states(np.array([idx]))
+
+    def _stop_at(self, idx: int, floor: int) -> bool:
+        """
+        Serve elevator idx's calls at `floor`, one of its targets, and drop the
+        target unless hall calls the other way still wait there.
+        Returns True if the doors open.
+        """
+        state = self.states[idx]
+        if state == 1:
+            ahead = self.targets[idx, floor + 1:].any()
+        else:
+            ahead = state == -1 and self.targets[idx, :floor].any()
+        opened, waiting = self._serve_stop(idx, floor, bool(ahead))
+        if not waiting:
+            self.targets[idx, floor] = False
+        return opened
+
+    def step_all(self):
+        """
+        Advance every elevator by one tick in a single vectorized pass.
+        Matches calling update_elevator for each elevator in order.
+        """
+        start = perf_counter_ns()
+        self.served_calls = []
+        self._step_cars()
+        self.clock += 1
+        self.metrics.step.record(perf_counter_ns() - start)
+
+    def _step_cars(self):
+        """
+        Vectorized body of step_all.
+        """
+        # cars holding their doors open only count down their dwell
+        holding = self._holds > 0
+        self._holds[holding & ~self.alerts] -= 1
+        busy = self.alerts | holding
+        active = self._cars[~busy] if busy.any() else self._cars
+        if active.size == 0:
+            return
+
+        # move one floor if needed
+        states = self.states[active]
+        floors = self.floors[active]
+        floors = floors - ((states == -1) & (floors > 1)) + \
+            ((states == 1) & (floors < self.floor_num))
+        self.floors[active] = floors
+
+        # open doors at target floors whose calls the car serves; only the
+        # cars at one of their targets need the per-call check
+        stop = self.targets[active, floors]
+        if stop.any():
+            self._stop_cars(stop, active, floors, states)
+        self.opens[active] = stop
+        self._holds[active[stop]] = self._dwell[floors[stop]]
+
+        # recalculate movement state
+        self._update_states(active)
+
+    def _stop_cars(self, stop: np.ndarray, cars: np.ndarray, floors: np.ndarray,
+                   states: np.ndarray):
+        """
+        `_stop_at` for the `cars` flagged in `stop`, now at `floors` and moving
+        in `states`: targets ahead are found for all of them at once, so only
+        the hall-call ownership check in `_serve_stop` runs per car.
+        Clears `stop` for the cars whose doors stay closed.
+        """
+        positions = np.flatnonzero(stop)
+        cars = cars[positions]
+        floors = floors[positions]
+        states = states[positions]
+        rows = self.targets[cars]
+        above = (rows & (self._floor_ids > floors[:, None])).any(axis=1)
+        below = (rows & (self._floor_ids < floors[:, None])).any(axis=1)
+        ahead = ((states == 1) & above) | ((states == -1) & below)
+        served = [self._serve_stop(idx, floor, more) for idx, floor, more in
+                  zip(cars.tolist(), floors.tolist(), ahead.tolist())]
+        opened, waiting = np.array(served, dtype=bool).T
+        stop[positions] = opened
+        self.targets[cars[~waiting], floors[~waiting]] = False
+
+    def _update_states(self, cars: np.ndarray):
+        """
+        Vectorized `_update_state` for the given elevator indices.
+        """
+        # avoid copying the whole matrix when every elevator is updated
+        targets = self.targets if cars is self._cars else self.targets[cars]
+        has_target = targets.any(axis=1)
+        lowest = targets.argmax(axis=1)
+        highest = self.floor_num - targets[:, ::-1].argmax(axis=1)
+        current = self.floors[cars]
+        states = self.states[cars]
+
+        # idle: choose nearest target direction
+        toward_lowest = np.abs(highest - current) >= np.abs(lowest - current)
+        idle_down = np.where(toward_lowest, lowest < current, highest <= current)
+        # moving: reverse once nothing is left ahead
+        reverse = ((states == 1) & (highest < current)) | \
+            ((states == -1) & (lowest > current))
+        new_states = np.where(states == 0, 1 - 2 * idle_down,
+                              np.where(reverse, -states, states))
+        # stop without targets or in alert
+        self.states[cars] = new_states * (has_target & ~self.alerts[cars])
+
+    def target_floors(self, idx: int) -> list:
+        """
+        Target floors of elevator idx in ascending order.
+        """
+        return np.flatnonzero(self.targets[idx]).tolist()
+
+    def _target_mask(self, idx: int) -> int:
+        """
+        Target floors of elevator idx as a bitmask.
+        """
+        mask = 0
+        for floor in self.target_floors(idx):
+            mask |= 1 << floor
+        return mask
+
+    def _load_cars(self, floors: list, targets: list, states: list, alerts: list,
+                   opens: list, holds: list):
+        """
+        Replace the per-elevator state; targets are given as bitmasks.
+        """
+        self.floors[:] = floors
+        self.states[:] = states
+        self.alerts[:] = alerts
+        self.opens[:] = opens
+        self._holds[:] = holds
+        self.targets[:] = False
+        for idx, mask in enumerate(targets):
+            self.targets[idx, list(_bits(mask))] = True
+
+    def is_idle(self) -> bool:
+        """
+        True when a step would change nothing.
+        """
+        return not self.states.any() and not self.opens.any() and \
+            not self.targets.any()
+
+    def assign_external(self, floor: int, direction: str = None) -> int:
+        """
+        Three-phase selection of Dispatcher.assign_external, scored over
+        all elevators at once. argmin keeps the lowest index on ties.
+        """
+        owner = self.hall_calls.get((floor, direction))
+        if owner is not None:
+            return owner + 1
+        if self.policy.name == "eta":
+            best_idx = self._best_eta(floor, direction)
+            if best_idx >= 0:
+                self._record_external(best_idx, floor, direction)
+            return best_idx + 1 if best_idx >= 0 else -1
+
+        available = ~self.alerts
+        distance = np.abs(self.floors - floor)
+        if direction == 'up':
+            moving = available & (self.states == 1) & (self.floors <= floor)
+        elif direction == 'down':
+            moving = available & (self.states == -1) & (self.floors >= floor)
+        else:
+            moving = np.zeros_like(available)
+
+        for candidates in (moving, available & (self.states == 0), available):
+            if candidates.any():
+                best_idx = int(np.where(candidates, distance, np.iinfo(np.int64).max).argmin())
+                break
+        else:
+            # No elevator available
+            return -1
+
+        self._record_external(best_idx, floor, direction)
+        return best_idx + 1
+
+    def _etas(self, floor: int, direction: str = None) -> np.ndarray:
+        """
+        Dispatcher.eta for every elevator at once. Pending stops are counted
+        with per-car prefix sums of dwell over the target matrix.
+        """
+        cars = self._cars
+        current = self.floors
+        states = self.states
+        travel = self._travel
+        # passed[idx, f]: dwell of idx's targets at floors <= f
+        passed = np.cumsum(self.targets * self._dwell, axis=1)
+
+        def stops(low, high):
+            return np.where(high > low, passed[cars, np.maximum(high, 0)] - passed[cars, low], 0)
+
+        has_target = self.targets.any(axis=1)
+        lowest = np.where(has_target, self.targets.argmax(axis=1), current)
+        highest = np.where(has_target, self.floor_num - self.targets[:, ::-1].argmax(axis=1), current)
+        turn_up = np.maximum(np.maximum(highest, current), floor)
+        turn_down = np.minimum(np.minimum(lowest, current), floor)
+        direct = travel[current, floor]
+
+        etas = np.select(
+            [states == 0,
+             (states == 1) & (floor >= current) & (direction != 'down'),
+             states == 1,
+             (floor <= current) & (direction != 'up')],
+            [direct,
+             direct + stops(current, floor - 1),
+             travel[current, turn_up] + travel[turn_up, floor] +
+             stops(current, turn_up) + stops(floor, current - 1),
+             direct + stops(floor, current - 1)],
+            default=travel[current, turn_down] + travel[turn_down, floor] +
+            stops(turn_down - 1, current - 1) + stops(current, floor - 1),
+        )
+        return etas + self._holds
+
+    def eta(self, idx: int, floor: int, direction: str = None) -> int:
+        """
+        Dispatcher.eta on the array state.
+        """
+        return int(self._etas(floor, direction)[idx])
+
+    def _eta_row(self, floor: int, direction: str, cars: list) -> list:
+        """
+        ETA of each elevator in `cars` to the call at `floor`.
+        """
+        return self._etas(floor, direction)[cars].tolist()
+
+    def _best_eta(self, floor: int, direction: str) -> int:
+        """
+        Non-alerted elevator with the lowest ETA (lowest idx among ties), or -1.
+        """
+        if self.alerts.all():
+            return -1
+        etas = np.where(self.alerts, np.iinfo(np.int64).max, self._etas(floor, direction))
+        return int(etas.argmin())
+
+    def toggle_alert(self, elevator_id: int) -> tuple:
+        """
+        Toggle alert for one elevator; on entering alert, reassign its hall calls.
+        Returns (new alert status, dropped calls).
+        """
+        idx = elevator_id - 1
+        self.alerts[idx] = not self.alerts[idx]
+        if not self.alerts[idx]:
+            return False, []
+        return True, self._reassign_hall_calls(idx)
+
+    def _set_target(self, idx: int, floor: int):
+        """
+        Add `floor` to the targets of elevator idx.
+        """
+        self.targets[idx, floor] = True
+
+    def _clear_target(self, idx: int, floor: int):
+        """
+        Drop `floor` from the targets of elevator idx.
+        """
+        self.targets[idx, floor] = False
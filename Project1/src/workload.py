@@ -0,0 +1,207 @@
+import argparse
+import random
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from dispatch import Dispatcher, FLOOR_NUM, ELEVATOR_NUM
+from simulation import Simulation
+
+# One passenger: arrival tick, origin floor and destination floor
+Passenger = namedtuple("Passenger", ["time", "origin", "destination"])
+
+# Traffic profiles: share of trips (from lobby, to lobby); the rest is inter-floor
+PROFILES = {
+    "up-peak": (0.85, 0.05),
+    "down-peak": (0.05, 0.85),
+    "lunch": (0.45, 0.45),
+    "inter-floor": (0.0, 0.0),
+}
+LOBBY = 1
+
+# Trace file: header (magic, version, floor_num, count), then columns of
+# arrival times (uint32), origins (uint16) and destinations (uint16)
+TRACE_MAGIC = b"ELVT"
+TRACE_VERSION = 1
+TRACE_HEADER = struct.Struct("<4sHHI")
+
+
+def generate(profile: str, duration: int, rate: float, floor_num: int = FLOOR_NUM,
+             seed: int = 0) -> list:
+    """
+    Generate a seeded passenger trace for a traffic `profile` over `duration`
+    ticks. Arrivals are Poisson with on average `rate` passengers per tick.
+    Returns Passengers sorted by arrival time.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"{profile} is not accepted.")
+    if rate <= 0:
+        raise ValueError(f"Arrival rate must be positive, got {rate}.")
+    from_lobby, to_lobby = PROFILES[profile]
+    rng = random.Random(seed)
+    trace = []
+    at = rng.expovariate(rate)
+    while at < duration:
+        draw = rng.random()
+        if draw < from_lobby:
+            origin, destination = LOBBY, rng.randint(LOBBY + 1, floor_num)
+        elif draw < from_lobby + to_lobby:
+            origin, destination = rng.randint(LOBBY + 1, floor_num), LOBBY
+        else:
+            origin = rng.randint(1, floor_num)
+            destination = rng.randint(1, floor_num - 1)
+            if destination >= origin:
+                destination += 1
+        trace.append(Passenger(int(at), origin, destination))
+        at += rng.expovariate(rate)
+    return trace
+
+
+def save(trace: list, path: str, floor_num: int = FLOOR_NUM):
+    """
+    Write a trace to `path` in the compact binary trace format.
+    """
+    times = array("I", (p.time for p in trace))
+    origins = array("H", (p.origin for p in trace))
+    destinations = array("H", (p.destination for p in trace))
+    if sys.byteorder == "big":
+        for column in (times, origins, destinations):
+            column.byteswap()
+    with open(path, "wb") as f:
+        f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, floor_num, len(trace)))
+        for column in (times, origins, destinations):
+            column.tofile(f)
+
+
+def load(path: str) -> tuple:
+    """
+    Read a trace written by `save`.
+    Returns (trace, floor_num).
+    """
+    with open(path, "rb") as f:
+        magic, version, floor_num, size = TRACE_HEADER.unpack(f.read(TRACE_HEADER.size))
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} trace file.")
+        columns = []
+        for typecode in ("I", "H", "H"):
+            column = array(typecode)
+            column.fromfile(f, size)
+            if sys.byteorder == "big":
+                column.byteswap()
+            columns.append(column)
+    return [Passenger(*p) for p in zip(*columns)], floor_num
+
+
+class TraceReplay:
+    """
+    Replay a passenger trace through a Simulation.
+    A passenger's arrival places an external call at the origin floor; when
+    the car owning that call serves it, the passengers waiting for its
+    direction board and press their destination (an internal request); they
+    leave when the car opens there.
+    """
+    def __init__(self, sim: Simulation, trace: list):
+        self.sim = sim
+        self.trace = trace
+        # (floor, direction) -> passengers waiting for a car, with arrival tick
+        self.waiting = {}
+        # per-elevator list of (passenger, boarding tick)
+        self.riding = [[] for _ in range(sim.dispatcher.elevator_num)]
+        # (passenger, boarding tick, arrival tick at destination)
+        self.completed = []
+        for passenger in trace:
+            sim.schedule(passenger.time, self._arrive, passenger)
+        sim.observers.append(self._on_tick)
+
+    def _arrive(self, passenger: Passenger):
+        """
+        Queue a passenger at its origin and call a car if none is coming yet.
+        """
+        direction = "up" if passenger.destination > passenger.origin else "down"
+        queue = self.waiting.setdefault((passenger.origin, direction), [])
+        if not queue:
+            self.sim.hall_call(passenger.origin, direction)
+        queue.append(passenger)
+
+    def _on_tick(self, sim: Simulation):
+        """
+        Let passengers leave every car that has its doors open, and board the
+        cars that served their hall call in this step.
+        """
+        dispatcher = sim.dispatcher
+        for idx, is_open in enumerate(dispatcher.opens):
+            if not is_open or not self.riding[idx]:
+                continue
+            floor = dispatcher.floors[idx]
+            staying = []
+            for passenger, boarded in self.riding[idx]:
+                if passenger.destination == floor:
+                    self.completed.append((passenger, boarded, sim.now))
+                else:
+                    staying.append((passenger, boarded))
+            self.riding[idx] = staying
+        for idx, floor, direction in dispatcher.served_calls:
+            queue = self.waiting.pop((floor, direction), None)
+            if queue:
+                riding = self.riding[idx]
+                for passenger in queue:
+                    riding.append((passenger, sim.now))
+                    dispatcher.assign_internal(idx + 1, passenger.destination)
+
+    def done(self) -> bool:
+        """
+        True once every passenger of the trace has reached its destination.
+        """
+        return len(self.completed) == len(self.trace)
+
+    def run(self, limit: int = None) -> list:
+        """
+        Run the simulation until every passenger arrived, or until tick `limit`.
+        Returns the completed (passenger, boarding tick, arrival tick) records.
+        """
+        sim = self.sim
+        end = self.trace[-1].time if self.trace else 0
+        while not self.done() and (limit is None or sim.now < limit):
+            if sim.now <= end:
+                sim.run_until(end + 1 if limit is None else min(end + 1, limit))
+            else:
+                sim.tick()
+        return self.completed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Elevator traffic traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="generate a trace file")
+    gen.add_argument("profile", choices=sorted(PROFILES))
+    gen.add_argument("output")
+    gen.add_argument("--duration", type=int, default=3600, help="ticks of traffic")
+    gen.add_argument("--rate", type=float, default=0.2, help="passengers per tick")
+    gen.add_argument("--floors", type=int, default=FLOOR_NUM)
+    gen.add_argument("--seed", type=int, default=0)
+
+    rep = commands.add_parser("replay", help="replay a trace headlessly")
+    rep.add_argument("trace")
+    rep.add_argument("--elevators", type=int, default=ELEVATOR_NUM)
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        trace = generate(args.profile, args.duration, args.rate, args.floors, args.seed)
+        save(trace, args.output, args.floors)
+        print(f"{len(trace)} passengers written to {args.output}")
+    else:
+        trace, floor_num = load(args.trace)
+        replay = TraceReplay(Simulation(Dispatcher(floor_num, args.elevators)), trace)
+        completed = replay.run()
+        waits = [boarded - p.time for p, boarded, _ in completed]
+        journeys = [arrived - p.time for p, _, arrived in completed]
+        count = len(completed)
+        print(f"{count} passengers in {replay.sim.now} ticks, "
+              f"average wait {sum(waits) / count if count else 0.0:.2f}, "
+              f"average journey {sum(journeys) / count if count else 0.0:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,14 @@
 import random
-from dispatch import Dispatcher, Page
+from dispatch import Dispatcher
+
+# Instructions per page
+PAGE_SIZE = 10
+
+
+def order_pages(order_seq, page_size=PAGE_SIZE):
+    """Page number of each instruction in an Allocation.order_seq"""
+    return [order // page_size for order in order_seq]
+
 
 class Allocation:
     """Generate instruction sequence and manage execution"""
@@ -81,4 +90,4 @@ class MemoryDispatch():
 
     def get_page(self):
         """Process current page request"""
-        self.dispatcher.accept_request(self.allocation.cur_order() // 10)
\ No newline at end of file
+        self.dispatcher.accept_request(self.allocation.cur_order() // PAGE_SIZE)
\ No newline at end of file
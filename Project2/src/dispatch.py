@@ -1,92 +1,295 @@
-import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QLineEdit
-from dataclasses import dataclass
+import heapq
+from collections import OrderedDict
 
-# Dataclass of Page
+method_names = ["FIFO", "LRU", "OPT", "Clock", "LFU", "ARC", "2Q"]
+# Events a Dispatcher reports to its subscribers:
+# hit(page), fault(page), evict(victim, page)
+event_names = ["hit", "fault", "evict"]
 
-@dataclass
-class Page:
-    index: int
-    order: int       # for FIFO algorithm
-    priority: int    # for LRU algorithm (lower is prior)
-
-method_names = ["FIFO", "LRU"]
-
-# Record the information of OS 
-# FIFO, LRU
+# Record the information of OS
+# FIFO, LRU, OPT (Belady), Clock (second chance), LFU, ARC, 2Q
 
 class Dispatcher:
-    """Memory page dispatcher supporting FIFO and LRU algorithms"""
-    
-    def __init__(self, sum_page_number, dispatch_method="FIFO"): 
+    """Memory page dispatcher supporting FIFO, LRU, OPT, Clock, LFU, ARC and 2Q algorithms.
+    OPT needs the whole page reference sequence up front as trace."""
+
+    def __init__(self, sum_page_number, dispatch_method="FIFO", trace=None):
         self._page_number = sum_page_number
-        self._occupy_page = {}  
-        self._occupy_page_num = 0
+        # Resident pages. FIFO/LRU: oldest first (by load time / last use);
+        # OPT: next use; Clock: frame slot; LFU: use count; ARC/2Q: queue holding it
+        self._occupy_page = OrderedDict()
         self._request_times = 0
         self._fault_times = 0
         self.dispatch_method = dispatch_method
+        # Event name -> subscribed callbacks; empty lists cost nothing per reference
+        self._subscribers = {event: [] for event in event_names}
 
         if dispatch_method not in method_names:
             raise ValueError(f"{dispatch_method} is not accepted.")
         if sum_page_number <= 0:
             raise ValueError(f"Negative page number: {sum_page_number} is not accepted.")
 
-    def _update_occupy_page(self, request_index):
-        """Update order and priority for existing pages"""
-        for index, value in self._occupy_page.items():
-            if index != request_index:
-                value.priority += 1
-                value.order += 1
+        # Per-algorithm hooks: hit on a resident page, load into a free frame, replace
+        self._hit = getattr(self, f"_hit_{dispatch_method}", None)
+        self._load = getattr(self, f"_load_{dispatch_method}", self._load_page)
+        self._replace = getattr(self, f"dispatch_{dispatch_method}")
+
+        if dispatch_method == "OPT":
+            if trace is None:
+                raise ValueError("OPT needs the page reference trace.")
+            self._trace = list(trace)
+            self._next_use = self._build_next_use(self._trace)
+            # max-heap of (-next use, page); stale entries are skipped lazily
+            self._heap = []
+        elif dispatch_method == "Clock":
+            self._frames = []
+            self._referenced = []
+            self._hand = 0
+        elif dispatch_method == "LFU":
+            # use count -> pages with that count, least recently used first
+            self._count_pages = {}
+            self._min_count = 0
+        elif dispatch_method == "ARC":
+            # resident recency/frequency lists, their ghost lists and target size of T1
+            self._t1, self._t2 = OrderedDict(), OrderedDict()
+            self._b1, self._b2 = OrderedDict(), OrderedDict()
+            self._p = 0
+        elif dispatch_method == "2Q":
+            # A1in: FIFO of new pages, A1out: ghosts evicted from it, Am: LRU of hot pages
+            self._a1in, self._a1out, self._am = OrderedDict(), OrderedDict(), OrderedDict()
+            self._kin = max(1, sum_page_number // 4)
+            self._kout = max(1, sum_page_number // 2)
+
+    def subscribe(self, event, callback):
+        """Call callback with the event arguments whenever event occurs"""
+        if event not in self._subscribers:
+            raise ValueError(f"{event} is not an event.")
+        self._subscribers[event].append(callback)
+
+    def unsubscribe(self, event, callback):
+        """Stop calling a subscribed callback"""
+        self._subscribers[event].remove(callback)
 
     def accept_request(self, request_index):
         """Process page request and handle page faults"""
         self._request_times += 1
+        subscribers = self._subscribers
         if request_index in self._occupy_page:
-            print(f"Page {request_index} already exists.")
-            for index, value in self._occupy_page.items():
-                if index == request_index:
-                    value.priority = 0
-                else:
-                    value.priority += 1
+            if self._hit is not None:
+                self._hit(request_index)
+            for callback in subscribers["hit"]:
+                callback(request_index)
         else:
             # Page fault occurred
             self._fault_times += 1
-            if self._occupy_page_num >= self._page_number:
-                print(f"Page fault: {request_index}")
-                if self.dispatch_method == "FIFO":
-                    self.dispatch_FIFO(request_index)
-                elif self.dispatch_method == 'LRU':
-                    self.dispatch_LRU(request_index)
+            for callback in subscribers["fault"]:
+                callback(request_index)
+            if len(self._occupy_page) >= self._page_number:
+                victim = self._replace(request_index)
+                for callback in subscribers["evict"]:
+                    callback(victim, request_index)
             else:
-                self._occupy_page_num += 1
-                self._occupy_page[request_index] = Page(
-                    index=request_index,
-                    order=0,
-                    priority=0
-                )
-                self._update_occupy_page(request_index)
+                self._load(request_index)
+
+    def _load_page(self, request_index):
+        """Load a page into a free frame"""
+        self._occupy_page[request_index] = None
 
     def dispatch_FIFO(self, request_index):
-        """Replace page using FIFO algorithm"""
-        max_index = max(self._occupy_page, key=lambda i: self._occupy_page[i].order)
-        self._occupy_page.pop(max_index)
-        self._occupy_page[request_index] = Page(
-            index=request_index,
-            order=0,
-            priority=0
-        )
-        self._update_occupy_page(request_index)
+        """Replace page using FIFO algorithm: evict the earliest loaded page, return it"""
+        victim, _ = self._occupy_page.popitem(last=False)
+        self._occupy_page[request_index] = None
+        return victim
+
+    def _hit_LRU(self, request_index):
+        self._occupy_page.move_to_end(request_index)
 
     def dispatch_LRU(self, request_index):
-        """Replace page using LRU algorithm"""
-        max_index = max(self._occupy_page, key=lambda i: self._occupy_page[i].priority)
-        self._occupy_page.pop(max_index)
-        self._occupy_page[request_index] = Page(
-            index=request_index,
-            order=0,
-            priority=0
-        )
-        self._update_occupy_page(request_index)
+        """Replace page using LRU algorithm: evict the least recently used page, return it"""
+        victim, _ = self._occupy_page.popitem(last=False)
+        self._occupy_page[request_index] = None
+        return victim
+
+    @staticmethod
+    def _build_next_use(trace):
+        """Position of the next reference to the same page after each position
+        (len(trace) if there is none)"""
+        next_use = [0] * len(trace)
+        seen = {}
+        never = len(trace)
+        for pos in range(len(trace) - 1, -1, -1):
+            page = trace[pos]
+            next_use[pos] = seen.get(page, never)
+            seen[page] = pos
+        return next_use
+
+    def _opt_next_use(self, request_index):
+        """Next use of the page referenced now, checked against the trace"""
+        pos = self._request_times - 1
+        if pos >= len(self._trace) or self._trace[pos] != request_index:
+            raise ValueError(f"Request {request_index} does not follow the OPT trace.")
+        return self._next_use[pos]
+
+    def _hit_OPT(self, request_index):
+        self._load_OPT(request_index)
+
+    def _load_OPT(self, request_index):
+        next_use = self._opt_next_use(request_index)
+        self._occupy_page[request_index] = next_use
+        heap = self._heap
+        heapq.heappush(heap, (-next_use, request_index))
+        if len(heap) > 2 * self._page_number + 16:
+            # drop the stale entries left behind by hits
+            self._heap = [(-use, page) for page, use in self._occupy_page.items()]
+            heapq.heapify(self._heap)
+
+    def dispatch_OPT(self, request_index):
+        """Replace page using OPT (Belady) algorithm: evict the page used again
+        furthest in the future, return it"""
+        occupy_page = self._occupy_page
+        while True:
+            use, victim = heapq.heappop(self._heap)
+            if occupy_page.get(victim) == -use:
+                break
+        del occupy_page[victim]
+        self._load_OPT(request_index)
+        return victim
+
+    def _hit_Clock(self, request_index):
+        self._referenced[self._occupy_page[request_index]] = True
+
+    def _load_Clock(self, request_index):
+        self._occupy_page[request_index] = len(self._frames)
+        self._frames.append(request_index)
+        self._referenced.append(True)
 
+    def dispatch_Clock(self, request_index):
+        """Replace page using Clock (second chance) algorithm: the hand clears
+        reference bits until it finds an unreferenced page, evicts it and returns it"""
+        frames, referenced = self._frames, self._referenced
+        hand = self._hand
+        while referenced[hand]:
+            referenced[hand] = False
+            hand = (hand + 1) % len(frames)
+        victim = frames[hand]
+        del self._occupy_page[victim]
+        self._occupy_page[request_index] = hand
+        frames[hand] = request_index
+        referenced[hand] = True
+        self._hand = (hand + 1) % len(frames)
+        return victim
 
+    def _hit_LFU(self, request_index):
+        count = self._occupy_page[request_index]
+        pages = self._count_pages[count]
+        del pages[request_index]
+        if not pages:
+            del self._count_pages[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._occupy_page[request_index] = count + 1
+        self._count_pages.setdefault(count + 1, OrderedDict())[request_index] = None
 
+    def _load_LFU(self, request_index):
+        self._occupy_page[request_index] = 1
+        self._count_pages.setdefault(1, OrderedDict())[request_index] = None
+        self._min_count = 1
+
+    def dispatch_LFU(self, request_index):
+        """Replace page using LFU algorithm: evict the least used resident page
+        (least recently used among ties), return it"""
+        pages = self._count_pages[self._min_count]
+        victim, _ = pages.popitem(last=False)
+        if not pages:
+            del self._count_pages[self._min_count]
+        del self._occupy_page[victim]
+        self._load_LFU(request_index)
+        return victim
+
+    def _hit_ARC(self, request_index):
+        del self._occupy_page[request_index][request_index]
+        self._arc_to_t2(request_index)
+
+    def _arc_to_t2(self, request_index):
+        self._t2[request_index] = None
+        self._occupy_page[request_index] = self._t2
+
+    def _load_ARC(self, request_index):
+        self._t1[request_index] = None
+        self._occupy_page[request_index] = self._t1
+
+    def _arc_evict(self, in_b2):
+        """Move the LRU page of T1 or T2 to its ghost list, return it"""
+        t1 = self._t1
+        if t1 and (len(t1) > self._p or (in_b2 and len(t1) == self._p)):
+            victim, _ = t1.popitem(last=False)
+            self._b1[victim] = None
+        else:
+            victim, _ = self._t2.popitem(last=False)
+            self._b2[victim] = None
+        del self._occupy_page[victim]
+        return victim
+
+    def dispatch_ARC(self, request_index):
+        """Replace page using ARC algorithm: adapt the split between recently and
+        frequently used pages from ghost hits, evict from the side over target, return it"""
+        c = self._page_number
+        t1, b1, b2 = self._t1, self._b1, self._b2
+        if request_index in b1:
+            self._p = min(c, self._p + max(len(b2) / len(b1), 1))
+            del b1[request_index]
+            victim = self._arc_evict(False)
+            self._arc_to_t2(request_index)
+            return victim
+        if request_index in b2:
+            self._p = max(0, self._p - max(len(b1) / len(b2), 1))
+            del b2[request_index]
+            victim = self._arc_evict(True)
+            self._arc_to_t2(request_index)
+            return victim
+        if len(t1) + len(b1) == c:
+            if len(t1) < c:
+                b1.popitem(last=False)
+                victim = self._arc_evict(False)
+            else:
+                victim, _ = t1.popitem(last=False)
+                del self._occupy_page[victim]
+        else:
+            if len(t1) + len(self._t2) + len(b1) + len(b2) == 2 * c:
+                b2.popitem(last=False)
+            victim = self._arc_evict(False)
+        self._load_ARC(request_index)
+        return victim
+
+    def _hit_2Q(self, request_index):
+        if self._occupy_page[request_index] is self._am:
+            self._am.move_to_end(request_index)
+
+    def _2q_queue(self, request_index):
+        """Queue a page enters: Am if it was evicted from A1in recently, else A1in"""
+        if request_index in self._a1out:
+            del self._a1out[request_index]
+            return self._am
+        return self._a1in
+
+    def _load_2Q(self, request_index):
+        queue = self._2q_queue(request_index)
+        queue[request_index] = None
+        self._occupy_page[request_index] = queue
+
+    def dispatch_2Q(self, request_index):
+        """Replace page using 2Q algorithm: evict the oldest new page once A1in is
+        over its share (remembering it in A1out), else the LRU hot page; return it"""
+        queue = self._2q_queue(request_index)
+        a1in = self._a1in
+        if a1in and (len(a1in) > self._kin or not self._am):
+            victim, _ = a1in.popitem(last=False)
+            self._a1out[victim] = None
+            if len(self._a1out) > self._kout:
+                self._a1out.popitem(last=False)
+        else:
+            victim, _ = self._am.popitem(last=False)
+        del self._occupy_page[victim]
+        queue[request_index] = None
+        self._occupy_page[request_index] = queue
+        return victim
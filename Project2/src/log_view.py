@@ -0,0 +1,61 @@
+from collections import deque
+from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtCore import QTimer
+
+# Lines kept in memory and shown in the widget
+LOG_CAPACITY = 1000
+# Milliseconds between two batched flushes to the widget
+FLUSH_INTERVAL = 100
+
+
+class LogView(QPlainTextEdit):
+    """Read-only log backed by a fixed-size ring buffer, flushed to the widget in batches"""
+
+    def __init__(self, capacity=LOG_CAPACITY, flush_interval=FLUSH_INTERVAL, path=None, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(capacity)
+        self.capacity = capacity
+        self._lines = deque(maxlen=capacity)
+        self._pending = 0  # lines appended since the last flush
+        self._stream = open(path, "a", encoding="utf-8") if path else None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def append(self, text):
+        """Buffer one line (and stream it to the log file) and schedule a flush"""
+        self._lines.append(text)
+        self._pending += 1
+        if self._stream is not None:
+            self._stream.write(text + "\n")
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Show all lines buffered since the last flush with a single append"""
+        count = min(self._pending, len(self._lines))
+        self._pending = 0
+        if count:
+            self.appendPlainText("\n".join(list(self._lines)[-count:]))
+        if self._stream is not None:
+            self._stream.flush()
+
+    def lines(self):
+        """Most recent `capacity` lines, oldest first"""
+        return list(self._lines)
+
+    def clear(self):
+        """Drop buffered and shown lines, keep the log file open"""
+        self._lines.clear()
+        self._pending = 0
+        super().clear()
+
+    def close_stream(self):
+        """Flush pending lines and close the log file"""
+        self._flush_timer.stop()
+        self.flush()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
@@ -1,10 +1,15 @@
 import sys
+import argparse
 from PyQt5.QtWidgets import QApplication
 from ui import PagingUI
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = PagingUI()
+    parser = argparse.ArgumentParser(description="Demand paging simulation")
+    parser.add_argument("--log-file", help="also write the full execution log to this file")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = PagingUI(log_path=args.log_file)
     window.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,82 @@
+import argparse
+from allocation import Allocation, order_pages
+
+
+class FenwickTree:
+    """Binary indexed tree over positions 1..size: point update and prefix sum in O(log n)"""
+
+    def __init__(self, size):
+        self._tree = [0] * (size + 1)
+
+    def add(self, position, delta):
+        tree = self._tree
+        while position < len(tree):
+            tree[position] += delta
+            position += position & -position
+
+    def prefix_sum(self, position):
+        """Sum of positions 1..position"""
+        tree = self._tree
+        total = 0
+        while position > 0:
+            total += tree[position]
+            position -= position & -position
+        return total
+
+
+def stack_distances(pages):
+    """Mattson LRU stack distance histogram of a page trace in one pass.
+    Returns (histogram, cold misses): histogram[d] counts references whose page was
+    at depth d of the LRU stack (1 = most recent); first references are cold misses."""
+    # one mark at the time of the latest reference to each page, so the marks
+    # after a page's previous reference count the distinct pages used since
+    marks = FenwickTree(len(pages))
+    last_use = {}
+    histogram = [0] * (len(pages) + 1)
+    cold = 0
+    for time, page in enumerate(pages, 1):
+        previous = last_use.get(page)
+        if previous is None:
+            cold += 1
+        else:
+            distance = marks.prefix_sum(time - 1) - marks.prefix_sum(previous) + 1
+            histogram[distance] += 1
+            marks.add(previous, -1)
+        marks.add(time, 1)
+        last_use[page] = time
+    del histogram[len(last_use) + 1:]
+    return histogram, cold
+
+
+def lru_fault_curve(pages, max_frames=None):
+    """LRU fault counts for every memory size 1..max_frames (default: until no
+    more than cold misses), from a single stack distance pass.
+    Returns a list where index m holds the faults with m frames (index 0: all references)."""
+    histogram, cold = stack_distances(pages)
+    if max_frames is None:
+        max_frames = len(histogram) - 1
+    faults = [len(pages)]
+    # references deeper than m frames miss, plus the cold misses
+    for frames in range(1, max_frames + 1):
+        hits = histogram[frames] if frames < len(histogram) else 0
+        faults.append(faults[-1] - hits)
+    return faults
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LRU miss ratio curve by stack distance analysis")
+    parser.add_argument("--orders", type=int, default=320, help="number of instructions")
+    parser.add_argument("--requests", type=int, default=320, help="length of the instruction sequence")
+    parser.add_argument("--max-frames", type=int, help="largest memory size to report")
+    args = parser.parse_args()
+
+    allocation = Allocation(order_nums=args.orders, request_order_nums=args.requests)
+    pages = order_pages(allocation.order_seq)
+    faults = lru_fault_curve(pages, args.max_frames)
+    print("frames  faults  fault rate")
+    for frames in range(1, len(faults)):
+        print(f"{frames:6d}  {faults[frames]:6d}  {faults[frames] / len(pages):9.2%}")
+
+
+if __name__ == "__main__":
+    main()
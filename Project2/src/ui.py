@@ -1,12 +1,13 @@
 import sys
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, 
                              QHBoxLayout, QGridLayout, QGroupBox, QProgressBar, 
-                             QComboBox, QSpinBox, QTextEdit, QFrame, QTableWidget, 
+                             QComboBox, QSpinBox, QFrame, QTableWidget, 
                              QTableWidgetItem, QHeaderView)
 from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QFont, QColor
-from allocation import MemoryDispatch, Allocation
-from dispatch import Dispatcher
+from allocation import MemoryDispatch, Allocation, PAGE_SIZE, order_pages
+from dispatch import Dispatcher, method_names
+from log_view import LogView
 
 class MemoryPageWidget(QFrame):
     """Memory page widget displaying instructions in table format"""
@@ -130,12 +131,14 @@ class MemoryPageWidget(QFrame):
 class PagingUI(QWidget):
     """Main UI class for memory paging visualization"""
     
-    def __init__(self):
+    def __init__(self, log_path=None):
         super().__init__()
+        self.log_path = log_path  # optional file receiving the full execution log
         self.memory_dispatch = None
         self.memory_widgets = {}
         self.frame_to_page = {}  # Frame ID to page ID mapping
         self.page_to_frame = {}  # Page ID to frame ID mapping
+        self.last_evicted = None  # Page replaced by the current request, reported by the dispatcher
         self.auto_timer = QTimer()
         self.auto_timer.timeout.connect(self.step_execute)
         self.execution_finished = False
@@ -227,10 +230,10 @@ class PagingUI(QWidget):
         log_group = QGroupBox("📝 执行日志")
         log_layout = QVBoxLayout()
         
-        self.log_text = QTextEdit()
+        self.log_text = LogView(path=self.log_path)
         self.log_text.setMaximumHeight(400)
         self.log_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 border: 1px solid #cccccc;
                 border-radius: 5px;
                 background-color: white;
@@ -267,7 +270,7 @@ class PagingUI(QWidget):
         
         params_layout.addWidget(QLabel("⚙️ 算法:"), 2, 0)
         self.algo_combo = QComboBox()
-        self.algo_combo.addItems(["FIFO", "LRU"])
+        self.algo_combo.addItems(method_names)
         self.algo_combo.setStyleSheet("padding: 3px; border: 1px solid #ccc; border-radius: 3px;")
         params_layout.addWidget(self.algo_combo, 2, 1)
         
@@ -360,8 +363,13 @@ class PagingUI(QWidget):
         
         # Create dispatcher with correct parameters
         self.memory_dispatch = MemoryDispatch()
-        self.memory_dispatch.dispatcher = Dispatcher(sum_page_number=memory_size, dispatch_method=algorithm)
-        self.memory_dispatch.allocation = Allocation(order_nums=inst_num, request_order_nums=inst_num)
+        allocation = Allocation(order_nums=inst_num, request_order_nums=inst_num)
+        self.memory_dispatch.allocation = allocation
+        # OPT looks ahead over the page sequence of the whole run
+        pages = order_pages(allocation.order_seq)
+        self.memory_dispatch.dispatcher = Dispatcher(sum_page_number=memory_size, dispatch_method=algorithm,
+                                                     trace=pages if algorithm == "OPT" else None)
+        self.memory_dispatch.dispatcher.subscribe("evict", self._on_evict)
         self.memory_dispatch.start()
         
         self.execution_finished = False
@@ -416,18 +424,17 @@ class PagingUI(QWidget):
             
         current_index = allocation.cur_index
         current_instruction = allocation.order_seq[current_index]
-        current_page = current_instruction // 10
+        current_page = current_instruction // PAGE_SIZE
         
         # Record state before execution
         old_fault_count = dispatcher._fault_times
-        old_memory_pages = set(dispatcher._occupy_page.keys())
+        self.last_evicted = None
         
         # Execute instruction
         dispatcher.accept_request(current_page)
         
         # Check page miss
         page_fault = dispatcher._fault_times > old_fault_count
-        new_memory_pages = set(dispatcher._occupy_page.keys())
         
         # Record index before moving to check completion
         old_index = allocation.cur_index
@@ -437,7 +444,7 @@ class PagingUI(QWidget):
         
         # Update frame mapping if page fault occurred
         if page_fault:
-            self.update_frame_mapping(old_memory_pages, new_memory_pages, current_page)
+            self.update_frame_mapping(self.last_evicted, current_page)
         
         # Update display
         self.update_display(current_instruction, current_page, page_fault)
@@ -457,17 +464,14 @@ class PagingUI(QWidget):
             self.progress_bar.setValue(len(allocation.order_seq))
             self.finish_simulation()
 
-    def update_frame_mapping(self, old_pages, new_pages, new_page):
-        """Update frame to page mapping relationships"""
-        # Find replaced pages
-        removed_pages = old_pages - new_pages
-        added_pages = new_pages - old_pages
-        
-        if removed_pages and added_pages:
+    def _on_evict(self, victim, page):
+        """Remember the page replaced by the current request"""
+        self.last_evicted = victim
+
+    def update_frame_mapping(self, removed_page, added_page):
+        """Update frame to page mapping after added_page was loaded, replacing removed_page if any"""
+        if removed_page is not None:
             # Page replacement occurred
-            removed_page = list(removed_pages)[0]
-            added_page = list(added_pages)[0]
-            
             # Find frame of replaced page
             if removed_page in self.page_to_frame:
                 frame_id = self.page_to_frame[removed_page]
@@ -479,10 +483,8 @@ class PagingUI(QWidget):
                 
                 self.log_text.append(f"   🔄 页框{frame_id}: 页面{removed_page} → 页面{added_page}")
         
-        elif added_pages and not removed_pages:
+        else:
             # New page loaded to empty frame
-            added_page = list(added_pages)[0]
-            
             # Find first empty frame
             for frame_id in range(self.memory_frame_count):
                 if self.frame_to_page[frame_id] is None:
@@ -608,6 +610,12 @@ class PagingUI(QWidget):
                 # Frame is empty
                 widget.set_empty()
                 
+    def closeEvent(self, event):
+        """Stop auto execution and close the log file"""
+        self.auto_timer.stop()
+        self.log_text.close_stream()
+        event.accept()
+
     def clear_memory_display(self):
         """Clear memory display"""
         for widget in self.memory_widgets.values():
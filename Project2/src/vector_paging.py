@@ -0,0 +1,313 @@
+import argparse
+import heapq
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from allocation import Allocation, PAGE_SIZE
+from dispatch import Dispatcher, method_names
+
+
+def trace_pages(order_seq, page_size=PAGE_SIZE):
+    """Page number of each instruction of an Allocation.order_seq as an array,
+    the NumPy counterpart of allocation.order_pages"""
+    return np.asarray(order_seq, dtype=np.int64) // page_size
+
+
+def simulate(pages, sum_page_number, dispatch_method="FIFO"):
+    """Run a whole page trace through one replacement algorithm.
+    Returns a dict with per-reference arrays `fault` (bool) and `evicted` (page
+    replaced by that reference, -1 if none) and the summary counters
+    `requests`, `faults`, `hits` and `fault_rate`."""
+    if dispatch_method not in method_names:
+        raise ValueError(f"{dispatch_method} is not accepted.")
+    if sum_page_number <= 0:
+        raise ValueError(f"Negative page number: {sum_page_number} is not accepted.")
+    pages = np.asarray(pages, dtype=np.int64)
+    # dense ids keep the order of the page numbers, so ties break the same way
+    ids, dense = np.unique(pages, return_inverse=True)
+    run = _SIMULATORS.get(dispatch_method)
+    if run is not None:
+        fault_at, evict_at, victims = run(dense, sum_page_number)
+    else:
+        fault_at, evict_at, victims = _simulate_hooks(dense, sum_page_number, dispatch_method)
+    fault = np.zeros(len(pages), dtype=bool)
+    fault[fault_at] = True
+    evicted = np.full(len(pages), -1, dtype=np.int64)
+    evicted[evict_at] = ids[np.asarray(victims, dtype=np.int64)]
+    faults = len(fault_at)
+    return {
+        "fault": fault,
+        "evicted": evicted,
+        "requests": len(pages),
+        "faults": faults,
+        "hits": len(pages) - faults,
+        "fault_rate": faults / len(pages) if len(pages) else 0.0,
+    }
+
+
+# The simulators below run one plain Python loop over dense page ids and
+# return (fault positions, eviction positions, dense victims); each matches
+# the Dispatcher algorithm of the same name reference for reference.
+
+def _simulate_fifo(dense, frames):
+    """FIFO: a page is resident iff it was one of the last `frames` loads, so a
+    hit is one comparison and the frames form a ring"""
+    # load number of each page id, far in the past if never loaded
+    loaded = [-frames - 1] * (int(dense.max()) + 1 if len(dense) else 0)
+    ring = [0] * frames
+    fault_at = []
+    victims = []
+    loads = 0
+    for pos, page in enumerate(dense.tolist()):
+        if loaded[page] >= loads - frames:
+            continue
+        fault_at.append(pos)
+        slot = loads % frames
+        if loads >= frames:
+            victims.append(ring[slot])
+        ring[slot] = page
+        loaded[page] = loads
+        loads += 1
+    # every fault after the first `frames` loads replaces a page
+    return fault_at, fault_at[frames:], victims
+
+
+def _simulate_lru(dense, frames):
+    """LRU: resident pages in an OrderedDict, least recently used first"""
+    resident = OrderedDict()
+    move_to_end = resident.move_to_end
+    popitem = resident.popitem
+    fault_at = []
+    victims = []
+    free = frames
+    for pos, page in enumerate(dense.tolist()):
+        if page in resident:
+            move_to_end(page)
+            continue
+        fault_at.append(pos)
+        if free:
+            free -= 1
+        else:
+            victims.append(popitem(last=False)[0])
+        resident[page] = None
+    return fault_at, fault_at[frames:], victims
+
+
+def _simulate_opt(dense, frames):
+    """OPT: next uses come from one stable argsort, the victim from a max-heap
+    of (-next use, page) whose stale entries are skipped lazily"""
+    n = len(dense)
+    order = np.argsort(dense, kind="stable")
+    same = dense[order[1:]] == dense[order[:-1]]
+    next_use = np.full(n, n, dtype=np.int64)
+    next_use[order[:-1][same]] = order[1:][same]
+    resident = {}
+    heap = []
+    push, pop = heapq.heappush, heapq.heappop
+    limit = 2 * frames + 16
+    fault_at = []
+    victims = []
+    free = frames
+    for pos, (page, use) in enumerate(zip(dense.tolist(), next_use.tolist())):
+        if page in resident:
+            resident[page] = use
+            push(heap, (-use, page))
+            if len(heap) > limit:
+                heap = [(-use, page) for page, use in resident.items()]
+                heapq.heapify(heap)
+            continue
+        fault_at.append(pos)
+        if free:
+            free -= 1
+        else:
+            while True:
+                victim_use, victim = pop(heap)
+                if resident.get(victim) == -victim_use:
+                    break
+            del resident[victim]
+            victims.append(victim)
+        resident[page] = use
+        push(heap, (-use, page))
+        if len(heap) > limit:
+            heap = [(-use, page) for page, use in resident.items()]
+            heapq.heapify(heap)
+    return fault_at, fault_at[frames:], victims
+
+
+def _simulate_clock(dense, frames):
+    """Clock: a frame ring with reference bits and a hand"""
+    slots = {}
+    ring = []
+    referenced = []
+    hand = 0
+    fault_at = []
+    victims = []
+    for pos, page in enumerate(dense.tolist()):
+        slot = slots.get(page)
+        if slot is not None:
+            referenced[slot] = True
+            continue
+        fault_at.append(pos)
+        if len(ring) < frames:
+            slots[page] = len(ring)
+            ring.append(page)
+            referenced.append(True)
+            continue
+        while referenced[hand]:
+            referenced[hand] = False
+            hand = (hand + 1) % frames
+        victim = ring[hand]
+        victims.append(victim)
+        del slots[victim]
+        slots[page] = hand
+        ring[hand] = page
+        referenced[hand] = True
+        hand = (hand + 1) % frames
+    return fault_at, fault_at[frames:], victims
+
+
+def _simulate_lfu(dense, frames):
+    """LFU: a page's place in its use-count bucket is its last reference, so the
+    victim is the least (count, last reference) in a heap whose stale entries
+    are skipped lazily"""
+    resident = {}
+    heap = []
+    push, pop = heapq.heappush, heapq.heappop
+    limit = 2 * frames + 16
+    fault_at = []
+    victims = []
+    free = frames
+    for pos, page in enumerate(dense.tolist()):
+        entry = resident.get(page)
+        if entry is None:
+            fault_at.append(pos)
+            if free:
+                free -= 1
+            else:
+                while True:
+                    victim_entry = pop(heap)
+                    victim = victim_entry[2]
+                    if resident.get(victim) is victim_entry:
+                        break
+                del resident[victim]
+                victims.append(victim)
+            entry = (1, pos, page)
+        else:
+            entry = (entry[0] + 1, pos, page)
+        resident[page] = entry
+        push(heap, entry)
+        if len(heap) > limit:
+            heap = list(resident.values())
+            heapq.heapify(heap)
+    return fault_at, fault_at[frames:], victims
+
+
+def _simulate_arc(dense, frames):
+    """ARC: resident lists T1/T2, ghost lists B1/B2 and the adaptive target p
+    for the size of T1"""
+    t1, t2, b1, b2 = OrderedDict(), OrderedDict(), OrderedDict(), OrderedDict()
+    p = 0
+    fault_at = []
+    victims = []
+    for pos, page in enumerate(dense.tolist()):
+        if page in t1:
+            del t1[page]
+            t2[page] = None
+            continue
+        if page in t2:
+            t2.move_to_end(page)
+            continue
+        fault_at.append(pos)
+        size = len(t1) + len(t2)
+        if size < frames:
+            t1[page] = None
+            continue
+        in_b2 = False
+        if page in b1:
+            p = min(frames, p + max(len(b2) / len(b1), 1))
+            del b1[page]
+            target = t2
+        elif page in b2:
+            p = max(0, p - max(len(b1) / len(b2), 1))
+            del b2[page]
+            in_b2 = True
+            target = t2
+        else:
+            target = t1
+            if len(t1) + len(b1) == frames:
+                if len(t1) == frames:
+                    victims.append(t1.popitem(last=False)[0])
+                    t1[page] = None
+                    continue
+                b1.popitem(last=False)
+            elif size + len(b1) + len(b2) == 2 * frames:
+                b2.popitem(last=False)
+        # move the LRU page of T1 or T2 to its ghost list
+        if t1 and (len(t1) > p or (in_b2 and len(t1) == p)):
+            victim = t1.popitem(last=False)[0]
+            b1[victim] = None
+        else:
+            victim = t2.popitem(last=False)[0]
+            b2[victim] = None
+        victims.append(victim)
+        target[page] = None
+    return fault_at, fault_at[frames:], victims
+
+
+def _simulate_hooks(dense, frames, dispatch_method):
+    """Any other algorithm through the Dispatcher's own hit/load/replace hooks,
+    without accept_request's counters and event dispatch"""
+    dispatcher = Dispatcher(frames, dispatch_method)
+    resident = dispatcher._occupy_page
+    hit, load, replace = dispatcher._hit, dispatcher._load, dispatcher._replace
+    fault_at = []
+    victims = []
+    free = frames
+    for pos, page in enumerate(dense.tolist()):
+        if page in resident:
+            if hit is not None:
+                hit(page)
+            continue
+        fault_at.append(pos)
+        if free:
+            free -= 1
+            load(page)
+        else:
+            victims.append(replace(page))
+    return fault_at, fault_at[frames:], victims
+
+
+# algorithm -> dedicated loop; the rest go through _simulate_hooks
+_SIMULATORS = {
+    "FIFO": _simulate_fifo,
+    "LRU": _simulate_lru,
+    "OPT": _simulate_opt,
+    "Clock": _simulate_clock,
+    "LFU": _simulate_lfu,
+    "ARC": _simulate_arc,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whole-trace paging simulation")
+    parser.add_argument("--orders", type=int, default=320, help="number of instructions")
+    parser.add_argument("--requests", type=int, default=1_000_000, help="length of the instruction sequence")
+    parser.add_argument("--frames", type=int, default=4, help="memory page frames")
+    parser.add_argument("--method", action="append", choices=method_names,
+                        help="replacement algorithm (repeatable, default all)")
+    args = parser.parse_args()
+
+    allocation = Allocation(order_nums=args.orders, request_order_nums=args.requests)
+    pages = trace_pages(allocation.order_seq)
+    for method in args.method or method_names:
+        start = time.perf_counter()
+        result = simulate(pages, args.frames, method)
+        elapsed = time.perf_counter() - start
+        print(f"{method:<6} faults {result['faults']:9d}  fault rate {result['fault_rate']:6.2%}  "
+              f"{result['requests'] / elapsed:12,.0f} refs/s")
+
+
+if __name__ == "__main__":
+    main()